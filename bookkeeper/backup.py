@@ -1,10 +1,146 @@
 """Backup functionality for Quicken files."""
 
+import ctypes
+import errno
+import functools
+import os
 import shutil
+import sys
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
+# Linux ioctl request to share a file's extents with another file (_IOW(0x94, 9, int))
+FICLONE = 0x40049409
+
+# macOS clonefile(2) flag: clone a symlink itself rather than its target
+CLONE_NOFOLLOW = 0x0001
+
+# Clone errors meaning the filesystem (or this src/dst pairing) can't clone at all.
+# EXDEV is strictly about the pair of volumes, not the filesystem, but a process
+# only ever backs up one Quicken file into one backup directory, so treating it as
+# "unsupported" for the rest of the process costs nothing.
+_CLONE_UNSUPPORTED = {
+    errno.EOPNOTSUPP, errno.ENOTSUP, errno.ENOTTY, errno.EXDEV, errno.EINVAL, errno.ENOSYS
+}
+
+# Cleared after the first such error so the remaining files skip straight to copying
+_clonefile_supported = True
+_ficlone_supported = True
+
+
+@functools.cache
+def _load_clonefile():
+    """
+    Resolve clonefile(2) once per process.
+
+    Returns:
+        ctypes function, or None if libSystem doesn't export it
+    """
+    # clonefile lives in libSystem, which is already loaded into every process
+    clonefile = getattr(ctypes.CDLL(None, use_errno=True), "clonefile", None)
+    if clonefile is not None:
+        clonefile.argtypes = [ctypes.c_char_p, ctypes.c_char_p, ctypes.c_uint32]
+    return clonefile
+
+
+def _clonefile(src: Path, dst: Path) -> bool:
+    """
+    Clone a file or whole directory tree with macOS clonefile(2).
+
+    Args:
+        src: Path to clone
+        dst: Destination path (must not exist)
+
+    Returns:
+        True if cloned, False if the platform or filesystem doesn't support it
+    """
+    global _clonefile_supported
+    if sys.platform != "darwin" or not _clonefile_supported:
+        return False
+
+    clonefile = _load_clonefile()
+    if clonefile is None:
+        _clonefile_supported = False
+        return False
+
+    if clonefile(os.fsencode(src), os.fsencode(dst), CLONE_NOFOLLOW) == 0:
+        return True
+
+    if ctypes.get_errno() in _CLONE_UNSUPPORTED:
+        _clonefile_supported = False
+    return False
+
+
+def _ficlone(src: Path, dst: Path) -> bool:
+    """
+    Clone a single file with the Linux FICLONE ioctl (Btrfs, XFS, bcachefs).
+
+    Args:
+        src: File to clone
+        dst: Destination file (created or truncated)
+
+    Returns:
+        True if cloned, False if the platform or filesystem doesn't support it
+    """
+    global _ficlone_supported
+    if not sys.platform.startswith("linux") or not _ficlone_supported:
+        return False
+
+    import fcntl
+
+    with open(src, "rb") as src_file, open(dst, "wb") as dst_file:
+        try:
+            fcntl.ioctl(dst_file.fileno(), FICLONE, src_file.fileno())
+        except OSError as e:
+            if e.errno in _CLONE_UNSUPPORTED:
+                _ficlone_supported = False
+            return False
+
+    shutil.copymode(src, dst)
+    return True
+
+
+def _copy_file(src: Path, dst: Path) -> None:
+    """
+    Copy a file, as a copy-on-write clone when the filesystem supports it.
+
+    Args:
+        src: File to copy
+        dst: Destination file
+    """
+    if _clonefile(src, dst) or _ficlone(src, dst):
+        return
+
+    # Contents and permissions only; timestamps aren't needed for a backup
+    shutil.copy(src, dst)
+
+
+def _reflink_copytree(src: Path, dst: Path) -> None:
+    """
+    Copy a directory tree, cloning file contents copy-on-write where possible.
+
+    On APFS the whole tree is cloned in one call, so the backup costs only
+    metadata regardless of file size. Elsewhere each file is cloned or copied.
+
+    Args:
+        src: Directory to copy
+        dst: Destination directory (must not exist)
+    """
+    if _clonefile(src, dst):
+        return
+
+    dst.mkdir()
+    with os.scandir(src) as entries:
+        for entry in entries:
+            target = dst / entry.name
+            if entry.is_symlink():
+                os.symlink(os.readlink(entry.path), target)
+            elif entry.is_dir():
+                _reflink_copytree(Path(entry.path), target)
+            else:
+                _copy_file(Path(entry.path), target)
+
 
 def create_backup(quicken_file: Path, backup_dir: Optional[Path] = None) -> Path:
     """
@@ -29,8 +165,8 @@ def create_backup(quicken_file: Path, backup_dir: Optional[Path] = None) -> Path
 
     # Copy the entire .quicken package
     if quicken_file.is_dir():
-        shutil.copytree(quicken_file, backup_path)
+        _reflink_copytree(quicken_file, backup_path)
     else:
-        shutil.copy2(quicken_file, backup_path)
+        _copy_file(quicken_file, backup_path)
 
     return backup_path
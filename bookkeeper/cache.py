@@ -0,0 +1,133 @@
+"""Persistent cache of LLM classification results."""
+
+import math
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+from .reader import Transaction, is_generic_payee
+
+DEFAULT_CACHE_PATH = Path.home() / ".bookkeeper" / "classify_cache.db"
+
+
+def amount_bucket(amount: float) -> str:
+    """
+    Bucket an amount by sign and order of magnitude.
+
+    Args:
+        amount: Transaction amount
+
+    Returns:
+        Bucket label, e.g. -12.50 -> "-1" and 250.00 -> "+2"
+    """
+    sign = "-" if amount < 0 else "+"
+    magnitude = int(math.log10(abs(amount))) if abs(amount) >= 1 else 0
+    return f"{sign}{magnitude}"
+
+
+class ClassificationCache:
+    """
+    SQLite-backed cache mapping (payee, amount bucket, account type) -> category.
+
+    Transactions with generic payees ("Unknown", "CHECK 1001", ...) are never
+    cached, since their payee says nothing about the category.
+    """
+
+    def __init__(self, db_path: Path = DEFAULT_CACHE_PATH):
+        """
+        Open (or create) the cache database.
+
+        Args:
+            db_path: Path to the cache SQLite file
+        """
+        self.db_path = db_path.expanduser()
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Shared across classifier worker threads; all access goes through the lock
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS classifications (
+                key TEXT PRIMARY KEY,
+                category TEXT NOT NULL,
+                confidence REAL NOT NULL,
+                ts INTEGER NOT NULL
+            )
+            """
+        )
+        self.conn.commit()
+
+        # In-process memo of lookups (including misses) so repeat payees skip SQLite
+        self._memo: dict[str, Optional[tuple[str, float]]] = {}
+
+    @staticmethod
+    def key(transaction: Transaction) -> str:
+        """
+        Build the cache key for a transaction.
+
+        Args:
+            transaction: Transaction to build a key for
+
+        Returns:
+            Cache key string
+        """
+        return "|".join([
+            transaction.normalized_payee,
+            amount_bucket(transaction.amount),
+            transaction.account_type or "",
+        ])
+
+    def get(self, transaction: Transaction) -> Optional[tuple[str, float]]:
+        """
+        Look up a cached classification.
+
+        Args:
+            transaction: Transaction to look up
+
+        Returns:
+            Tuple of (category, confidence), or None on a cache miss
+        """
+        if is_generic_payee(transaction.normalized_payee):
+            return None
+
+        key = self.key(transaction)
+        with self._lock:
+            if key in self._memo:
+                return self._memo[key]
+
+            cursor = self.conn.execute(
+                "SELECT category, confidence FROM classifications WHERE key = ?", (key,)
+            )
+            row = cursor.fetchone()
+            self._memo[key] = (row[0], row[1]) if row else None
+            return self._memo[key]
+
+    def set(self, transaction: Transaction, category: str, confidence: float) -> None:
+        """
+        Store a classification.
+
+        Args:
+            transaction: Transaction that was classified
+            category: Category assigned
+            confidence: Confidence score (0-1)
+        """
+        if is_generic_payee(transaction.normalized_payee):
+            return
+
+        key = self.key(transaction)
+        with self._lock:
+            self._memo[key] = (category, confidence)
+
+            self.conn.execute(
+                "INSERT OR REPLACE INTO classifications (key, category, confidence, ts) VALUES (?, ?, ?, ?)",
+                (key, category, confidence, int(time.time()))
+            )
+            self.conn.commit()
+
+    def close(self) -> None:
+        """Close the cache database."""
+        with self._lock:
+            self.conn.close()
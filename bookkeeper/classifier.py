@@ -1,30 +1,128 @@
 """Transaction classification using ML and LLM."""
 
-import json
+import asyncio
+import importlib.util
+import random
+import re
+import time
+from collections import defaultdict
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import islice
+from pathlib import Path
 from typing import Optional
 
-from anthropic import Anthropic
+try:
+    import orjson as _json
+except ImportError:  # Optional: pip install bookkeeper[fast]
+    import json as _json
 
-from .reader import Transaction
+try:
+    import ahocorasick
+except ImportError:  # Optional: pip install bookkeeper[fast]
+    ahocorasick = None
+
+from .cache import DEFAULT_CACHE_PATH, ClassificationCache
+from .rate_limit import RateLimiter
+from .reader import Transaction, is_generic_payee
+
+# Optional: pip install bookkeeper[fast]. Only probed here; httpx imports it when used
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# Claude model used for all LLM classification requests
+LLM_MODEL = "claude-haiku-4-5-20251001"
+
+# Polling schedule (seconds) while waiting for a Message Batch to finish
+BATCH_POLL_INITIAL_DELAY = 1.0
+BATCH_POLL_MAX_DELAY = 60.0
+
+# Default client-side limits for concurrent requests (the API's entry-tier limits);
+# callers with higher limits should pass their own to aclassify_many
+REQUESTS_PER_MINUTE = 50
+INPUT_TOKENS_PER_MINUTE = 50_000
+
+# Extra retries for rate-limited or overloaded async requests, after the SDK's own
+LLM_MAX_RETRIES = 3
+LLM_RETRY_BASE_DELAY = 0.5
+
+# Transactions per grouped prompt, and output tokens budgeted for each
+LLM_GROUP_SIZE = 25
+GROUP_TOKENS_PER_TRANSACTION = 50
+
+# Maximum simultaneous single-transaction requests when a group falls back
+SINGLETON_CONCURRENCY = 8
+
+
+def _chunked(items: Iterable[Transaction], size: int) -> Iterator[list[Transaction]]:
+    """Yield successive lists of at most `size` items."""
+    iterator = iter(items)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
 
 
 class TransactionClassifier:
     """Classifies transactions using ensemble approach: rules + ML + LLM."""
 
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(
+        self, api_key: Optional[str] = None, cache_path: Optional[Path] = DEFAULT_CACHE_PATH
+    ):
         """
         Initialize classifier.
 
         Args:
             api_key: Anthropic API key for LLM classification
+            cache_path: SQLite file for caching LLM results across runs (None disables)
         """
-        self.client = Anthropic(api_key=api_key) if api_key else None
+        self.client = None
+        self.async_client = None
+        if api_key:
+            # Imported here so offline, rule-only runs don't pay the SDK's import cost
+            from anthropic import (
+                Anthropic,
+                AsyncAnthropic,
+                DefaultAsyncHttpxClient,
+                DefaultHttpxClient,
+            )
+
+            # Each client keeps one connection pool for the classifier's lifetime; with
+            # HTTP/2, concurrent requests are multiplexed over a single TLS connection
+            self.client = Anthropic(
+                api_key=api_key, http_client=DefaultHttpxClient(http2=HTTP2_AVAILABLE)
+            )
+            self.async_client = AsyncAnthropic(
+                api_key=api_key, http_client=DefaultAsyncHttpxClient(http2=HTTP2_AVAILABLE)
+            )
         # TODO: Load trained ML model if available
         self.ml_model = None
+        self.cache = ClassificationCache(cache_path) if cache_path else None
+
+        # Derived data for the most recently used category list, stored as
+        # (categories, value) pairs so worker threads swap them atomically.
+        # Both are keyed on the list's contents, not its identity, so a caller
+        # mutating the same list never gets a prompt or lookup out of step with it.
+        self._system_memo: tuple[Optional[tuple[str, ...]], list[dict]] = (None, [])
+        self._category_memo: tuple[Optional[tuple[str, ...]], dict[str, str]] = (None, {})
 
         # Rule-based patterns: payee substring -> category
         # Case-insensitive matching
         self.rules = self._load_default_rules()
+        self._automaton = self._build_automaton(self.rules)
+        # Fallback when pyahocorasick is unavailable: one alternation over the lowercased
+        # payee, longest pattern first so it wins among matches starting at the same position
+        self._rule_re = self._build_rule_regex(self.rules)
+        self._rule_map = {pattern.lower(): category for pattern, category in self.rules.items()}
+
+    def __enter__(self) -> "TransactionClassifier":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the classification cache, if open."""
+        if self.cache is not None:
+            self.cache.close()
+            self.cache = None
 
     def _load_default_rules(self) -> dict[str, str]:
         """
@@ -113,6 +211,47 @@ class TransactionClassifier:
             "zipcar": "Auto & Transport",
         }
 
+    def _build_automaton(self, rules: dict[str, str]):
+        """
+        Build an Aho-Corasick automaton matching all rule patterns in one pass.
+
+        Args:
+            rules: Dictionary mapping payee patterns to categories
+
+        Returns:
+            Automaton, or None if pyahocorasick is not installed
+        """
+        if ahocorasick is None or not rules:
+            return None
+
+        automaton = ahocorasick.Automaton()
+        for order, (pattern, category) in enumerate(rules.items()):
+            pattern = pattern.lower()
+            automaton.add_word(pattern, (len(pattern), order, category))
+        automaton.make_automaton()
+        return automaton
+
+    def _build_rule_regex(self, rules: dict[str, str]) -> Optional[re.Pattern]:
+        """
+        Compile all lowercased rule patterns into a single alternation.
+
+        The pattern is matched against the lowercased payee, like the automaton, rather
+        than with re.IGNORECASE: Unicode case folding differs from str.lower() (e.g.
+        "ſ" matches "s"), which would let the two matchers disagree and produce
+        match text that is not a key of the rule map.
+
+        Args:
+            rules: Dictionary mapping payee patterns to categories
+
+        Returns:
+            Compiled pattern, or None if there are no rules
+        """
+        if not rules:
+            return None
+
+        patterns_sorted = sorted({pattern.lower() for pattern in rules}, key=len, reverse=True)
+        return re.compile("(" + "|".join(re.escape(pattern) for pattern in patterns_sorted) + ")")
+
     def classify(self, transaction: Transaction, available_categories: list[str]) -> tuple[str, float]:
         """
         Classify a transaction and return suggested category with confidence.
@@ -124,6 +263,207 @@ class TransactionClassifier:
         Returns:
             Tuple of (suggested_category, confidence_score)
         """
+        local_suggestion = self._classify_locally(transaction, available_categories)
+        if local_suggestion:
+            return local_suggestion
+
+        # Fall back to LLM for complex cases
+        if self.client:
+            return self._classify_with_llm(transaction, available_categories)
+
+        # No classification available
+        return transaction.category or "Uncategorized", 0.0
+
+    def classify_many(
+        self, transactions: list[Transaction], available_categories: list[str]
+    ) -> dict[int, tuple[str, float]]:
+        """
+        Classify many transactions, grouping the LLM cases into shared prompts.
+
+        Rule and ML matches are resolved locally. The rest are deduplicated by
+        signature and sent up to LLM_GROUP_SIZE per prompt; more than one group
+        is submitted through the Message Batches API, which runs asynchronously
+        at half the cost of individual requests.
+
+        Args:
+            transactions: Transactions to classify
+            available_categories: List of valid categories from Quicken
+
+        Returns:
+            Dictionary mapping transaction_id -> (suggested_category, confidence_score)
+        """
+        results = {}
+        pending = []
+
+        for transaction in transactions:
+            local_suggestion = self._classify_locally(transaction, available_categories)
+            if local_suggestion:
+                results[transaction.id] = local_suggestion
+            else:
+                pending.append(transaction)
+
+        if not pending:
+            return results
+
+        if not self.client:
+            for transaction in pending:
+                results[transaction.id] = (transaction.category or "Uncategorized", 0.0)
+            return results
+
+        # Classify one representative per signature and share its result
+        duplicates = self._group_by_signature(pending)
+        representatives = [group[0] for group in duplicates.values()]
+
+        if len(representatives) <= LLM_GROUP_SIZE:
+            # A single group isn't worth waiting on a batch job for
+            suggestions = self._classify_llm_group(representatives, available_categories)
+        else:
+            suggestions = self._classify_with_batch(representatives, available_categories)
+
+        for group in duplicates.values():
+            for transaction in group:
+                results[transaction.id] = suggestions[group[0].id]
+        return results
+
+    async def aclassify_many(
+        self,
+        transactions: list[Transaction],
+        available_categories: list[str],
+        concurrency: int = 10,
+        progress_callback: Optional[Callable[[int], None]] = None,
+        requests_per_minute: Optional[float] = None,
+        input_tokens_per_minute: Optional[float] = None,
+    ) -> dict[int, tuple[str, float]]:
+        """
+        Classify many transactions with up to `concurrency` LLM calls in flight.
+
+        Unlike classify_many, results are available as soon as the individual
+        requests complete, which suits interactive runs. Transactions sharing a
+        signature are classified once.
+
+        Args:
+            transactions: Transactions to classify
+            available_categories: List of valid categories from Quicken
+            concurrency: Maximum number of simultaneous LLM requests
+            progress_callback: Optional function called with the number of
+                transactions each time some finish classifying
+            requests_per_minute: Client-side cap on LLM requests per minute
+                (defaults to REQUESTS_PER_MINUTE)
+            input_tokens_per_minute: Client-side cap on estimated input tokens per
+                minute (defaults to INPUT_TOKENS_PER_MINUTE)
+
+        Returns:
+            Dictionary mapping transaction_id -> (suggested_category, confidence_score)
+        """
+        results = {}
+        pending = []
+
+        for transaction in transactions:
+            local_suggestion = self._classify_locally(transaction, available_categories)
+            if local_suggestion:
+                results[transaction.id] = local_suggestion
+            else:
+                pending.append(transaction)
+
+        def report(count: int) -> None:
+            if progress_callback and count:
+                progress_callback(count)
+
+        # Count rows, not IDs: split transactions share one ID across several rows
+        report(len(transactions) - len(pending))
+
+        if not pending:
+            return results
+
+        if not self.async_client:
+            for transaction in pending:
+                results[transaction.id] = (transaction.category or "Uncategorized", 0.0)
+            report(len(pending))
+            return results
+
+        semaphore = asyncio.Semaphore(concurrency)
+        rate_limiter = RateLimiter(
+            requests_per_minute or REQUESTS_PER_MINUTE,
+            input_tokens_per_minute or INPUT_TOKENS_PER_MINUTE,
+        )
+
+        # Classify one representative per signature and share its result
+        async def classify_group(group: list[Transaction]) -> None:
+            async with semaphore:
+                suggestion = await self._aclassify_with_llm(
+                    group[0], available_categories, rate_limiter
+                )
+            for transaction in group:
+                results[transaction.id] = suggestion
+            report(len(group))
+
+        duplicates = self._group_by_signature(pending)
+
+        outcomes = await asyncio.gather(
+            *(classify_group(group) for group in duplicates.values()),
+            return_exceptions=True,
+        )
+
+        for group, outcome in zip(duplicates.values(), outcomes):
+            if isinstance(outcome, BaseException):
+                print(f"Error classifying transaction {group[0].id}: {outcome}")
+                for transaction in group:
+                    results[transaction.id] = ("Uncategorized", 0.0)
+                report(len(group))
+
+        return results
+
+    def _signature(self, transaction: Transaction) -> str:
+        """
+        Build the deduplication signature for a transaction.
+
+        Transactions with the same signature are assumed to get the same category.
+        Generic payees ("Unknown", "CHECK 1001", ...) say nothing about the merchant,
+        so those transactions get a signature of their own.
+
+        Args:
+            transaction: Transaction to build a signature for
+
+        Returns:
+            Signature of normalized payee, account type and amount sign, or
+            of the transaction ID for generic payees
+        """
+        if is_generic_payee(transaction.normalized_payee):
+            return f"#{transaction.id}"
+
+        sign = "-" if transaction.amount < 0 else "+"
+        return f"{transaction.normalized_payee}|{transaction.account_type}|{sign}"
+
+    def _group_by_signature(
+        self, transactions: list[Transaction]
+    ) -> dict[str, list[Transaction]]:
+        """
+        Group transactions by signature, preserving first-seen order.
+
+        Args:
+            transactions: Transactions to group
+
+        Returns:
+            Dictionary mapping signature -> transactions with that signature
+        """
+        groups: dict[str, list[Transaction]] = defaultdict(list)
+        for transaction in transactions:
+            groups[self._signature(transaction)].append(transaction)
+        return groups
+
+    def _classify_locally(
+        self, transaction: Transaction, available_categories: list[str]
+    ) -> Optional[tuple[str, float]]:
+        """
+        Classify using rules, the ML model, and cached LLM results, without any network calls.
+
+        Args:
+            transaction: Transaction to classify
+            available_categories: Valid categories
+
+        Returns:
+            Tuple of (category, confidence), or None if the LLM is needed
+        """
         # Try rule-based classification first
         rule_suggestion = self._apply_rules(transaction)
         if rule_suggestion:
@@ -135,12 +475,14 @@ class TransactionClassifier:
             if ml_suggestion[1] > 0.8:  # High confidence threshold
                 return ml_suggestion
 
-        # Fall back to LLM for complex cases
-        if self.client:
-            return self._classify_with_llm(transaction, available_categories)
+        # Reuse an earlier LLM result for the same merchant, if still a valid category
+        if self.cache:
+            cached = self.cache.get(transaction)
+            category_lookup = self._category_lookup(available_categories)
+            if cached and category_lookup.get(cached[0].lower()) == cached[0]:
+                return cached
 
-        # No classification available
-        return transaction.category or "Uncategorized", 0.0
+        return None
 
     def _apply_rules(self, transaction: Transaction) -> Optional[str]:
         """
@@ -152,15 +494,21 @@ class TransactionClassifier:
         Returns:
             Category if a rule matches, None otherwise
         """
-        # Case-insensitive payee matching
-        payee_lower = transaction.payee.lower()
+        # Single scan over the payee; the leftmost match wins, longest pattern
+        # first among matches at the same position, then the earliest rule
+        if self._automaton is not None:
+            payee_lower = transaction.payee.lower()
+            matches = [
+                (end - length + 1, -length, order, category)
+                for end, (length, order, category) in self._automaton.iter(payee_lower)
+            ]
+            return min(matches)[3] if matches else None
 
-        # Check each rule pattern
-        for pattern, category in self.rules.items():
-            if pattern in payee_lower:
-                return category
+        if self._rule_re is None:
+            return None
 
-        return None
+        match = self._rule_re.search(transaction.payee.lower())
+        return self._rule_map[match.group(1).lower()] if match else None
 
     def _classify_with_ml(
         self, transaction: Transaction, available_categories: list[str]
@@ -180,132 +528,591 @@ class TransactionClassifier:
         # - Use trained model (Random Forest, Gradient Boosting, etc.)
         return "Uncategorized", 0.0
 
-    def _classify_with_llm(
-        self, transaction: Transaction, available_categories: list[str]
+    def _remember(
+        self, transaction: Transaction, suggestion: tuple[str, float]
     ) -> tuple[str, float]:
         """
-        Classify using Claude LLM with web search tool.
+        Store a successful LLM classification in the persistent cache.
 
         Args:
-            transaction: Transaction to classify
-            available_categories: Valid categories
+            transaction: Transaction that was classified
+            suggestion: Tuple of (category, confidence) from the LLM
 
         Returns:
-            Tuple of (category, confidence)
+            The suggestion, unchanged
         """
-        if not self.client:
-            return "Uncategorized", 0.0
+        category, confidence = suggestion
+        if self.cache and category != "Uncategorized" and confidence > 0:
+            self.cache.set(transaction, category, confidence)
+        return suggestion
 
-        try:
-            # Format categories for better readability
-            categories_formatted = "\n".join([f"  - {cat}" for cat in available_categories])
+    def _format_transaction(self, transaction: Transaction) -> str:
+        """
+        Format transaction details as a bulleted list for a prompt.
 
-            # Get day of week for additional context
-            day_of_week = transaction.date.strftime("%A")
+        Args:
+            transaction: Transaction to describe
 
-            # Build rich context
-            context_parts = [
-                f"Date: {transaction.date} ({day_of_week})",
-                f"Payee: {transaction.payee}",
-                f"Amount: ${transaction.amount:.2f}",
-            ]
+        Returns:
+            One "- Label: value" line per available detail
+        """
+        # Get day of week for additional context
+        day_of_week = transaction.date.strftime("%A")
+
+        # Build rich context
+        context_parts = [
+            f"Date: {transaction.date} ({day_of_week})",
+            f"Payee: {transaction.payee}",
+            f"Amount: ${transaction.amount:.2f}",
+        ]
+
+        # Add account information
+        if transaction.account_name:
+            account_desc = transaction.account_name
+            if transaction.account_type:
+                # Make account type more readable
+                readable_type = transaction.account_type.replace('CREDITCARD', 'Credit Card').replace('CHECKING', 'Checking')
+                account_desc = f"{account_desc} ({readable_type})"
+            context_parts.append(f"Account: {account_desc}")
 
-            # Add account information
-            if transaction.account_name:
-                account_desc = transaction.account_name
-                if transaction.account_type:
-                    # Make account type more readable
-                    readable_type = transaction.account_type.replace('CREDITCARD', 'Credit Card').replace('CHECKING', 'Checking')
-                    account_desc = f"{account_desc} ({readable_type})"
-                context_parts.append(f"Account: {account_desc}")
+        # Add FI note (card last 4 digits)
+        if transaction.fi_note:
+            context_parts.append(f"Card/Account: {transaction.fi_note}")
 
-            # Add FI note (card last 4 digits)
-            if transaction.fi_note:
-                context_parts.append(f"Card/Account: {transaction.fi_note}")
+        # Add memo if available
+        if transaction.memo:
+            context_parts.append(f"Memo: {transaction.memo}")
 
-            # Add memo if available
-            if transaction.memo:
-                context_parts.append(f"Memo: {transaction.memo}")
+        # Add reference if available
+        if transaction.reference:
+            context_parts.append(f"Reference: {transaction.reference}")
 
-            # Add reference if available
-            if transaction.reference:
-                context_parts.append(f"Reference: {transaction.reference}")
+        # Add check number if available
+        if transaction.check_number:
+            context_parts.append(f"Check #: {transaction.check_number}")
+
+        return "- " + "\n- ".join(context_parts)
+
+    def _build_system(self, available_categories: list[str]) -> list[dict]:
+        """
+        Build the system prompt shared by every classification request.
 
-            # Add check number if available
-            if transaction.check_number:
-                context_parts.append(f"Check #: {transaction.check_number}")
+        The block is marked for prompt caching, so repeated requests with the same
+        category list only pay full price for the per-transaction details.
 
-            transaction_details = "\n- ".join(context_parts)
+        Args:
+            available_categories: Valid categories
+
+        Returns:
+            System content blocks for the Anthropic API
+        """
+        # Reuse the blocks while the caller keeps passing the same categories
+        categories = tuple(available_categories)
+        memo_categories, memo_blocks = self._system_memo
+        if categories == memo_categories:
+            return memo_blocks
 
-            # Build prompt
-            prompt = f"""You are a financial transaction categorization expert. Analyze this transaction and suggest the most appropriate category.
+        # Number the categories so responses can refer to them by index
+        categories_formatted = "\n".join(f"{i}) {cat}" for i, cat in enumerate(available_categories))
 
-Transaction Details:
-- {transaction_details}
+        system_prompt = f"""You are a financial transaction categorization expert. Analyze each transaction and suggest the most appropriate category.
 
 Available Categories:
 {categories_formatted}
 
 Instructions:
 1. Identify the merchant from the payee information using your knowledge
-2. Choose the single most appropriate category from the list above
+2. Choose the single most appropriate category from the list above, by its number
 3. Provide a confidence score between 0.0 and 1.0
-4. Consider ALL transaction details including payee, account type, day of week, amount, and any memo/reference
+4. Consider ALL transaction details including payee, account type, day of week, amount, and any memo/reference"""
+
+        system_blocks = [
+            {"type": "text", "text": system_prompt, "cache_control": {"type": "ephemeral"}}
+        ]
+        self._system_memo = (categories, system_blocks)
+        return system_blocks
+
+    def _build_messages(self, transaction: Transaction) -> list[dict]:
+        """
+        Build the classification prompt for a transaction.
+
+        Args:
+            transaction: Transaction to classify
+
+        Returns:
+            Messages list for the Anthropic API, ending with a JSON prefill
+        """
+        transaction_details = self._format_transaction(transaction)
+
+        # Build prompt
+        prompt = f"""Transaction Details:
+{transaction_details}
 
 Respond with valid JSON only, in this exact format:
 {{
-  "category": "CATEGORY_NAME",
+  "index": CATEGORY_NUMBER,
   "confidence": 0.95
 }}
 
 Example responses:
-{{"category": "Groceries", "confidence": 0.95}}
-{{"category": "Electronics & Software", "confidence": 0.88}}
-{{"category": "Gas & Fuel", "confidence": 0.92}}"""
-
-            # API call with JSON prefill for structured output
-            messages = [
-                {"role": "user", "content": prompt},
-                {"role": "assistant", "content": "{"}  # Prefill to force JSON output
-            ]
-            response = self.client.messages.create(
-                model="claude-haiku-4-5-20251001",
+{{"index": 12, "confidence": 0.95}}
+{{"index": 3, "confidence": 0.88}}
+{{"index": 27, "confidence": 0.92}}"""
+
+        # JSON prefill for structured output
+        return [
+            {"role": "user", "content": prompt},
+            {"role": "assistant", "content": "{"}  # Prefill to force JSON output
+        ]
+
+    def _build_group_messages(self, transactions: list[Transaction]) -> list[dict]:
+        """
+        Build one classification prompt covering several transactions.
+
+        Args:
+            transactions: Transactions to classify
+
+        Returns:
+            Messages list for the Anthropic API, ending with a JSON array prefill
+        """
+        transaction_blocks = "\n\n".join(
+            f"### TXN {transaction.id}\n{self._format_transaction(transaction)}"
+            for transaction in transactions
+        )
+
+        prompt = f"""{transaction_blocks}
+
+Respond with a JSON array only, one object per ### TXN id, in order:
+[
+  {{"id": 123, "index": CATEGORY_NUMBER, "confidence": 0.95}},
+  {{"id": 456, "index": CATEGORY_NUMBER, "confidence": 0.88}}
+]"""
+
+        return [
+            {"role": "user", "content": prompt},
+            {"role": "assistant", "content": "["}  # Prefill to force a JSON array
+        ]
+
+    def _response_text(self, content: list) -> str:
+        """
+        Get the text of the first text block in a response.
+
+        Args:
+            content: Content blocks of the assistant message
+
+        Returns:
+            Stripped text, or an empty string if there is none
+        """
+        for block in content:
+            if hasattr(block, "text"):
+                return block.text.strip()
+        return ""
+
+    def _category_lookup(self, available_categories: list[str]) -> dict[str, str]:
+        """
+        Get a case-insensitive lookup for the available categories.
+
+        Args:
+            available_categories: Valid categories
+
+        Returns:
+            Dictionary mapping lowercased category -> category as listed
+        """
+        # Reuse the lookup while the caller keeps passing the same categories
+        categories = tuple(available_categories)
+        memo_categories, memo_lookup = self._category_memo
+        if categories == memo_categories:
+            return memo_lookup
+
+        # Reversed so the first of any case-insensitive duplicates wins
+        lookup = {cat.lower(): cat for cat in reversed(categories)}
+        self._category_memo = (categories, lookup)
+        return lookup
+
+    def _validate_category(
+        self, category: str, confidence: float, available_categories: list[str]
+    ) -> tuple[str, float]:
+        """
+        Map an LLM-suggested category onto the available categories.
+
+        Args:
+            category: Category name returned by the LLM
+            confidence: Confidence returned by the LLM
+            available_categories: Valid categories
+
+        Returns:
+            Tuple of (category, confidence), or ("Uncategorized", 0.0) if not valid
+        """
+        canonical = self._category_lookup(available_categories).get(category.lower())
+        return (canonical, confidence) if canonical else ("Uncategorized", 0.0)
+
+    def _resolve_choice(self, data: dict, available_categories: list[str]) -> tuple[str, float]:
+        """
+        Resolve one parsed LLM answer to a category.
+
+        Args:
+            data: Parsed JSON object with "index" (or "category") and "confidence"
+            available_categories: Valid categories, in the order they were numbered
+
+        Returns:
+            Tuple of (category, confidence), or ("Uncategorized", 0.0) if not valid
+        """
+        confidence = float(data.get("confidence", 0.0))
+
+        index = data.get("index")
+        if type(index) is int and 0 <= index < len(available_categories):
+            return available_categories[index], confidence
+
+        # Tolerate answers that name the category instead of numbering it
+        category = data.get("category")
+        if isinstance(category, str):
+            return self._validate_category(category.strip(), confidence, available_categories)
+
+        return "Uncategorized", 0.0
+
+    def _parse_group_response(
+        self, content: list, available_categories: list[str]
+    ) -> dict[int, tuple[str, float]]:
+        """
+        Parse a prefilled JSON array response covering several transactions.
+
+        Args:
+            content: Content blocks of the assistant message
+            available_categories: Valid categories
+
+        Returns:
+            Dictionary mapping transaction_id -> (category, confidence) for every
+            entry that parsed; empty if the response is not a valid JSON array
+        """
+        try:
+            data = _json.loads("[" + self._response_text(content))
+        except ValueError:  # json and orjson decode errors both subclass ValueError
+            return {}
+
+        if not isinstance(data, list):
+            return {}
+
+        results = {}
+        for item in data:
+            try:
+                results[int(item["id"])] = self._resolve_choice(item, available_categories)
+            except (AttributeError, KeyError, TypeError, ValueError):
+                # Skip malformed entries; they fall back to singleton mode
+                continue
+
+        return results
+
+    def _parse_response(
+        self, response_text: str, available_categories: list[str]
+    ) -> tuple[str, float]:
+        """
+        Parse a prefilled JSON classification response.
+
+        Args:
+            response_text: Response text following the "{" prefill
+            available_categories: Valid categories
+
+        Returns:
+            Tuple of (category, confidence)
+        """
+        # Add opening brace from prefill and parse JSON
+        try:
+            json_str = "{" + response_text.strip()
+            data = _json.loads(json_str)
+
+            return self._resolve_choice(data, available_categories)
+
+        except (AttributeError, KeyError, TypeError, ValueError) as e:
+            # JSON parsing failed
+            return "Uncategorized", 0.0
+
+    def _is_complete_response(self, response_text: str) -> bool:
+        """
+        Check whether streamed response text already holds the whole JSON answer.
+
+        Args:
+            response_text: Text received so far, following the "{" prefill
+
+        Returns:
+            True once the text parses as a JSON object
+        """
+        # Only worth attempting once a closing brace has arrived
+        if "}" not in response_text:
+            return False
+
+        try:
+            _json.loads("{" + response_text.strip())
+        except ValueError:
+            return False
+
+        return True
+
+    def _classify_with_llm(
+        self, transaction: Transaction, available_categories: list[str]
+    ) -> tuple[str, float]:
+        """
+        Classify using Claude LLM with web search tool.
+
+        Args:
+            transaction: Transaction to classify
+            available_categories: Valid categories
+
+        Returns:
+            Tuple of (category, confidence)
+        """
+        if not self.client:
+            return "Uncategorized", 0.0
+
+        try:
+            # Stream the answer and stop reading as soon as the JSON object is complete
+            response_text = ""
+            with self.client.messages.stream(
+                model=LLM_MODEL,
                 max_tokens=1000,
-                messages=messages
+                system=self._build_system(available_categories),
+                messages=self._build_messages(transaction)
+            ) as stream:
+                for text in stream.text_stream:
+                    response_text += text
+                    if self._is_complete_response(response_text):
+                        break
+
+            return self._remember(
+                transaction, self._parse_response(response_text, available_categories)
             )
 
-            # Parse final response as JSON
-            response_text = ""
-            for block in response.content:
-                if hasattr(block, "text"):
-                    response_text = block.text.strip()
-                    break
+        except Exception as e:
+            # Log error and return uncategorized
+            print(f"Error classifying transaction {transaction.id}: {e}")
+            return "Uncategorized", 0.0
 
-            # Add opening brace from prefill and parse JSON
-            try:
-                json_str = "{" + response_text
-                data = json.loads(json_str)
+    async def _aclassify_with_llm(
+        self,
+        transaction: Transaction,
+        available_categories: list[str],
+        rate_limiter: Optional[RateLimiter] = None,
+    ) -> tuple[str, float]:
+        """
+        Classify using Claude LLM without blocking the event loop.
+
+        Args:
+            transaction: Transaction to classify
+            available_categories: Valid categories
+            rate_limiter: Optional limiter to wait on before sending the request
+
+        Returns:
+            Tuple of (category, confidence)
+        """
+        if not self.async_client:
+            return "Uncategorized", 0.0
 
-                category = data.get("category", "").strip()
-                confidence = float(data.get("confidence", 0.0))
+        # Already loaded by __init__ whenever async_client is set
+        from anthropic import InternalServerError, RateLimitError
 
-                # Validate category exists in available categories
-                if category in available_categories:
-                    return category, confidence
-                else:
-                    # Try case-insensitive match
-                    for cat in available_categories:
-                        if cat.lower() == category.lower():
-                            return cat, confidence
+        try:
+            max_tokens = 1000
+            system = self._build_system(available_categories)
+            messages = self._build_messages(transaction)
+
+            # Rough estimate of input tokens (~4 characters each). Output isn't
+            # charged: streaming stops after a few tokens, far below max_tokens
+            prompt_chars = sum(len(block["text"]) for block in system)
+            prompt_chars += sum(len(message["content"]) for message in messages)
+            estimated_tokens = prompt_chars // 4
 
-                    # Category not found in available categories
-                    return "Uncategorized", 0.0
+            for attempt in range(LLM_MAX_RETRIES + 1):
+                if rate_limiter:
+                    await rate_limiter.acquire(estimated_tokens)
 
-            except (json.JSONDecodeError, ValueError, KeyError) as e:
-                # JSON parsing failed
-                return "Uncategorized", 0.0
+                try:
+                    # Stream the answer and stop reading as soon as the JSON object is complete
+                    response_text = ""
+                    async with self.async_client.messages.stream(
+                        model=LLM_MODEL,
+                        max_tokens=max_tokens,
+                        system=system,
+                        messages=messages
+                    ) as stream:
+                        async for text in stream.text_stream:
+                            response_text += text
+                            if self._is_complete_response(response_text):
+                                break
+                    break
+                except (RateLimitError, InternalServerError):
+                    if attempt == LLM_MAX_RETRIES:
+                        raise
+                    # Jittered backoff, so concurrent requests don't all retry in lockstep
+                    delay = LLM_RETRY_BASE_DELAY * (2 ** attempt)
+                    await asyncio.sleep(delay * (1 + 0.2 * random.random()))
+            return self._remember(
+                transaction, self._parse_response(response_text, available_categories)
+            )
 
         except Exception as e:
             # Log error and return uncategorized
             print(f"Error classifying transaction {transaction.id}: {e}")
             return "Uncategorized", 0.0
+
+    def _classify_llm_group(
+        self, transactions: list[Transaction], available_categories: list[str]
+    ) -> dict[int, tuple[str, float]]:
+        """
+        Classify several transactions with a single grouped prompt.
+
+        Args:
+            transactions: Transactions to classify (at most LLM_GROUP_SIZE)
+            available_categories: Valid categories
+
+        Returns:
+            Dictionary mapping transaction_id -> (category, confidence)
+        """
+        if not self.client:
+            return {transaction.id: ("Uncategorized", 0.0) for transaction in transactions}
+
+        try:
+            response = self.client.messages.create(
+                model=LLM_MODEL,
+                max_tokens=GROUP_TOKENS_PER_TRANSACTION * len(transactions),
+                system=self._build_system(available_categories),
+                messages=self._build_group_messages(transactions)
+            )
+            content = response.content
+
+        except Exception as e:
+            # Log error; the whole group falls back to singleton mode
+            print(f"Error classifying group of {len(transactions)} transactions: {e}")
+            content = []
+
+        results, unparsed = self._resolve_group(transactions, content, available_categories)
+        results.update(self._classify_singly(unparsed, available_categories))
+        return results
+
+    def _resolve_group(
+        self, transactions: list[Transaction], content: list, available_categories: list[str]
+    ) -> tuple[dict[int, tuple[str, float]], list[Transaction]]:
+        """
+        Collect results for a grouped prompt.
+
+        Args:
+            transactions: Transactions that were in the group
+            content: Content blocks of the group response (empty if the request failed)
+            available_categories: Valid categories
+
+        Returns:
+            Tuple of (transaction_id -> (category, confidence) for parsed entries,
+            transactions missing from the response)
+        """
+        parsed = self._parse_group_response(content, available_categories)
+
+        results = {}
+        unparsed = []
+        for transaction in transactions:
+            if transaction.id in parsed:
+                results[transaction.id] = self._remember(transaction, parsed[transaction.id])
+            else:
+                unparsed.append(transaction)
+
+        return results, unparsed
+
+    def _classify_singly(
+        self, transactions: list[Transaction], available_categories: list[str]
+    ) -> dict[int, tuple[str, float]]:
+        """
+        Classify transactions with one request each, running the requests concurrently.
+
+        Args:
+            transactions: Transactions to classify
+            available_categories: Valid categories
+
+        Returns:
+            Dictionary mapping transaction_id -> (category, confidence)
+        """
+        if not transactions:
+            return {}
+
+        # I/O bound, so threads overlap the round-trips despite the GIL
+        max_workers = min(len(transactions), SINGLETON_CONCURRENCY)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(self._classify_with_llm, transaction, available_categories): transaction
+                for transaction in transactions
+            }
+            return {futures[future].id: future.result() for future in as_completed(futures)}
+
+    def _classify_with_batch(
+        self, transactions: list[Transaction], available_categories: list[str]
+    ) -> dict[int, tuple[str, float]]:
+        """
+        Classify transactions with a single Message Batches API job.
+
+        Transactions are split into groups of LLM_GROUP_SIZE, one batch request
+        per group.
+
+        Args:
+            transactions: Transactions to classify
+            available_categories: Valid categories
+
+        Returns:
+            Dictionary mapping transaction_id -> (category, confidence)
+        """
+        if not self.client:
+            return {transaction.id: ("Uncategorized", 0.0) for transaction in transactions}
+
+        # Batch results come back in arbitrary order, keyed by custom_id
+        groups = {
+            f"group-{index}": group
+            for index, group in enumerate(_chunked(transactions, LLM_GROUP_SIZE))
+        }
+        contents = {}
+        batch = None
+
+        try:
+            batch = self.client.messages.batches.create(
+                requests=[
+                    {
+                        "custom_id": custom_id,
+                        "params": {
+                            "model": LLM_MODEL,
+                            "max_tokens": GROUP_TOKENS_PER_TRANSACTION * len(group),
+                            "system": self._build_system(available_categories),
+                            "messages": self._build_group_messages(group),
+                        },
+                    }
+                    for custom_id, group in groups.items()
+                ]
+            )
+
+            # Poll with exponential backoff until processing has ended
+            delay = BATCH_POLL_INITIAL_DELAY
+            while batch.processing_status != "ended":
+                time.sleep(delay)
+                delay = min(delay * 2, BATCH_POLL_MAX_DELAY)
+                batch = self.client.messages.batches.retrieve(batch.id)
+
+            for entry in self.client.messages.batches.results(batch.id):
+                # Errored, canceled and expired requests fall back to singleton mode
+                if entry.result.type == "succeeded":
+                    contents[entry.custom_id] = entry.result.message.content
+
+        except Exception as e:
+            # Log error; every group without a result falls back to singleton mode
+            print(f"Error classifying batch of {len(transactions)} transactions: {e}")
+
+            # Cancel a still-running job so it isn't billed on top of the fallback
+            if batch is not None and batch.processing_status != "ended":
+                try:
+                    self.client.messages.batches.cancel(batch.id)
+                except Exception as cancel_error:
+                    print(f"Error canceling batch {batch.id}: {cancel_error}")
+
+        results = {}
+        unparsed = []
+        for custom_id, group in groups.items():
+            group_results, group_unparsed = self._resolve_group(
+                group, contents.get(custom_id, []), available_categories
+            )
+            results.update(group_results)
+            unparsed.extend(group_unparsed)
+
+        results.update(self._classify_singly(unparsed, available_categories))
+        return results
@@ -1,18 +1,12 @@
 """Command-line interface for Bookkeeper."""
 
+import time
 from datetime import date, datetime
 from pathlib import Path
 from typing import Optional
 
 import typer
 from rich.console import Console
-from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TaskProgressColumn
-from rich.table import Table
-
-from .backup import create_backup
-from .classifier import TransactionClassifier
-from .reader import QuickenReader
-from .writer import QuickenWriter
 
 app = typer.Typer(help="AI-powered financial data cleanup for better reporting")
 console = Console()
@@ -26,6 +20,10 @@ def main(
     account_types: Optional[str] = typer.Option(None, "--account-types", help="Comma-separated account types (e.g., CHECKING,CREDITCARD)"),
     list_accounts: bool = typer.Option(False, "--list-accounts", help="List all accounts by type and exit"),
     dry_run: bool = typer.Option(False, "--dry-run", help="Preview changes without applying"),
+    no_cache: bool = typer.Option(False, "--no-cache", help="Don't read or store cached LLM results (~/.bookkeeper/classify_cache.db)"),
+    concurrency: int = typer.Option(8, "--concurrency", min=1, envvar="BOOKKEEPER_CONCURRENCY", help="Maximum simultaneous LLM requests"),
+    requests_per_minute: Optional[int] = typer.Option(None, "--requests-per-minute", min=1, envvar="BOOKKEEPER_REQUESTS_PER_MINUTE", help="LLM requests per minute allowed by your API tier (default: 50)"),
+    input_tokens_per_minute: Optional[int] = typer.Option(None, "--input-tokens-per-minute", min=1, envvar="BOOKKEEPER_INPUT_TOKENS_PER_MINUTE", help="LLM input tokens per minute allowed by your API tier (default: 50000)"),
     api_key: Optional[str] = typer.Option(None, "--api-key", envvar="ANTHROPIC_API_KEY", help="Anthropic API key"),
 ):
     """
@@ -44,6 +42,18 @@ def main(
         # Apply changes for a specific date range
         bookkeeper myfile.quicken --start-date 2024-01-01 --end-date 2024-12-31
     """
+    # Imported here so --help doesn't pay for asyncio, rich.progress, and the SDK
+    import asyncio
+
+    from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TaskProgressColumn
+    from rich.table import Table
+
+    from .backup import create_backup
+    from .cache import DEFAULT_CACHE_PATH
+    from .classifier import TransactionClassifier
+    from .reader import QuickenReader
+    from .writer import QuickenWriter
+
     console.print(f"[bold blue]Bookkeeper v{__import__('bookkeeper').__version__}[/bold blue]")
     console.print()
 
@@ -57,8 +67,8 @@ def main(
 
     # Handle --list-accounts
     if list_accounts:
-        reader = QuickenReader(quicken_file)
-        accounts = reader.get_all_accounts()
+        with QuickenReader(quicken_file) as reader:
+            accounts = reader.get_all_accounts()
 
         console.print("[bold cyan]Accounts by Type[/bold cyan]")
         console.print()
@@ -97,24 +107,21 @@ def main(
 
     # Read transactions
     console.print("[cyan]Reading transactions...[/cyan]")
-    reader = QuickenReader(quicken_file)
-    transactions = reader.read_transactions(
-        start_date=parsed_start,
-        end_date=parsed_end,
-        account_types=parsed_account_types
-    )
-    categories = reader.get_all_categories()
-
-    console.print(f"[green]Found {len(transactions)} transactions[/green]")
+    # Only the update path, which has just backed up the file, may add the join index;
+    # dry runs must leave it untouched
+    with QuickenReader(quicken_file, read_only=dry_run) as reader:
+        # Only uncategorized transactions (None, empty string, or "Uncategorized")
+        uncategorized = reader.read_transactions(
+            start_date=parsed_start,
+            end_date=parsed_end,
+            account_types=parsed_account_types,
+            only_uncategorized=True
+        )
+        categories = reader.get_all_categories()
+
     console.print(f"[green]Available categories: {len(categories)}[/green]")
     console.print()
 
-    # Find uncategorized transactions (None, empty string, or "Uncategorized" category)
-    uncategorized = [
-        t for t in transactions
-        if not t.category or t.category == "Uncategorized"
-    ]
-
     if not uncategorized:
         console.print("[green]All transactions are already categorized![/green]")
         return
@@ -122,28 +129,53 @@ def main(
     console.print(f"[yellow]Found {len(uncategorized)} uncategorized transactions[/yellow]")
     console.print()
 
-    # Initialize classifier
-    classifier = TransactionClassifier(api_key=api_key)
-
-    # Classify and build suggestions with progress bar
-    suggestions = {}
-    with Progress(
-        SpinnerColumn(),
-        TextColumn("[progress.description]{task.description}"),
-        BarColumn(),
-        TaskProgressColumn(),
-        console=console
-    ) as progress:
+    # Initialize classifier and classify concurrently with progress bar;
+    # the classification cache is closed once classification is done
+    with (
+        TransactionClassifier(
+            api_key=api_key, cache_path=None if no_cache else DEFAULT_CACHE_PATH
+        ) as classifier,
+        Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            BarColumn(),
+            TaskProgressColumn(),
+            console=console,
+            refresh_per_second=10
+        ) as progress,
+    ):
         task = progress.add_task(
             "[cyan]Classifying transactions...",
             total=len(uncategorized)
         )
 
-        for txn in uncategorized:
-            suggested_category, confidence = classifier.classify(txn, categories)
-            # Show all suggestions regardless of confidence for now
-            suggestions[txn.id] = (txn, suggested_category, confidence)
-            progress.advance(task)
+        done = 0
+        last_update = time.monotonic()
+
+        def on_progress(count: int) -> None:
+            nonlocal done, last_update
+            done += count
+            # Update the bar at most every 100ms, plus once when finished
+            now = time.monotonic()
+            if done == len(uncategorized) or now - last_update >= 0.1:
+                progress.update(task, completed=done)
+                last_update = now
+
+        classifications = asyncio.run(classifier.aclassify_many(
+            uncategorized,
+            categories,
+            concurrency=concurrency,
+            progress_callback=on_progress,
+            requests_per_minute=requests_per_minute,
+            input_tokens_per_minute=input_tokens_per_minute,
+        ))
+
+    # Show all suggestions regardless of confidence for now; split transactions
+    # appear once per cashflow entry, so keep one row per transaction ID
+    suggestions = [
+        (txn, *classifications[txn.id])
+        for txn in {t.id: t for t in uncategorized}.values()
+    ]
 
     console.print()
 
@@ -162,7 +194,7 @@ def main(
     table.add_column("Suggested Category", style="green")
     table.add_column("Conf", justify="right")
 
-    for txn, category, confidence in suggestions.values():
+    for txn, category, confidence in suggestions:
         # Format account name (truncate if too long)
         account = (txn.account_name[:15] + "...") if txn.account_name and len(txn.account_name) > 18 else (txn.account_name or "")
 
@@ -188,15 +220,13 @@ def main(
     else:
         console.print("[cyan]Applying categorizations...[/cyan]")
 
-        # Prepare updates dict
-        updates = {txn.id: category for txn, category, _ in suggestions.values()}
-
         # Get database path and create writer
         db_path = quicken_file / "data"
-        writer = QuickenWriter(db_path)
-
-        # Apply updates
-        results = writer.update_categories(updates)
+        with QuickenWriter(db_path) as writer:
+            # Apply updates, streaming (id, category) pairs straight to the writer
+            results = writer.update_categories_batch(
+                (txn.id, category) for txn, category, _ in suggestions
+            )
 
         # Report results
         successes = sum(1 for success in results.values() if success)
@@ -1,13 +1,21 @@
 """Evaluation system for tracking classification accuracy and learning from corrections."""
 
 import json
-from dataclasses import asdict, dataclass
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import IO, Optional
 
+try:
+    import orjson as _fast_json
+except ImportError:  # Optional: pip install bookkeeper[fast]
+    _fast_json = json
 
-@dataclass
+# Write buffer for the results log; records reach disk on flush/close
+RESULTS_BUFFER_SIZE = 1024 * 1024
+
+
+@dataclass(slots=True)
 class ClassificationResult:
     """Record of a classification decision."""
 
@@ -33,6 +41,32 @@ class EvalSystem:
         self.eval_dir = eval_dir
         self.eval_dir.mkdir(exist_ok=True)
         self.results_file = eval_dir / "classification_results.jsonl"
+        self._results_handle: Optional[IO[str]] = None
+
+    def __enter__(self) -> "EvalSystem":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def _results(self) -> IO[str]:
+        """
+        Get the results log handle, opening it for append on first use.
+
+        Returns:
+            Buffered handle shared by all records of this session
+        """
+        if self._results_handle is None:
+            self._results_handle = open(
+                self.results_file, "a", buffering=RESULTS_BUFFER_SIZE
+            )
+        return self._results_handle
+
+    def close(self) -> None:
+        """Flush and close the results log, if open."""
+        if self._results_handle is not None:
+            self._results_handle.close()
+            self._results_handle = None
 
     def record_classification(
         self,
@@ -52,19 +86,19 @@ class EvalSystem:
             confidence: Confidence score (0-1)
             transaction_data: Full transaction data for future training
         """
-        result = ClassificationResult(
-            transaction_id=transaction_id,
-            original_category=original_category,
-            suggested_category=suggested_category,
-            confidence=confidence,
-            actual_category=None,
-            timestamp=datetime.now().isoformat(),
-            transaction_data=transaction_data,
-        )
+        # Same fields as ClassificationResult, built directly to skip asdict's deep copy
+        result = {
+            "transaction_id": transaction_id,
+            "original_category": original_category,
+            "suggested_category": suggested_category,
+            "confidence": confidence,
+            "actual_category": None,
+            "timestamp": datetime.now().isoformat(),
+            "transaction_data": transaction_data,
+        }
 
         # Append to JSONL file
-        with open(self.results_file, "a") as f:
-            f.write(json.dumps(asdict(result)) + "\n")
+        self._results().write(json.dumps(result, separators=(",", ":")) + "\n")
 
     def record_correction(self, transaction_id: int, actual_category: str) -> None:
         """
@@ -85,27 +119,80 @@ class EvalSystem:
         Returns:
             Dictionary with accuracy metrics
         """
+        # Make buffered records visible to the reader below
+        if self._results_handle is not None:
+            self._results_handle.flush()
+
         if not self.results_file.exists():
             return {"total": 0, "correct": 0, "accuracy": 0.0}
 
+        counts = self._count_correct_arrow()
+        total, correct = counts if counts is not None else self._count_correct_lines()
+
+        accuracy = correct / total if total > 0 else 0.0
+
+        return {
+            "total": total,
+            "correct": correct,
+            "accuracy": accuracy,
+        }
+
+    def _count_correct_arrow(self) -> Optional[tuple[int, int]]:
+        """
+        Count corrected and correctly-suggested records with pyarrow's columnar reader.
+
+        Returns:
+            Tuple of (total, correct), or None if pyarrow is unavailable or
+            can't parse the log
+        """
+        try:
+            import pyarrow as pa
+            import pyarrow.compute as pc
+            import pyarrow.json as paj
+        except ImportError:  # Optional: pip install bookkeeper[fast]
+            return None
+
+        # Only the two compared columns are materialized; everything else is skipped
+        schema = pa.schema([
+            ("suggested_category", pa.string()),
+            ("actual_category", pa.string()),
+        ])
+        parse_options = paj.ParseOptions(
+            explicit_schema=schema, unexpected_field_behavior="ignore"
+        )
+        try:
+            table = paj.read_json(self.results_file, parse_options=parse_options)
+        except pa.ArrowInvalid:
+            return None
+
+        corrected = table.filter(pc.is_valid(table["actual_category"]))
+        matches = pc.equal(corrected["suggested_category"], corrected["actual_category"])
+        return corrected.num_rows, pc.sum(matches).as_py() or 0
+
+    def _count_correct_lines(self) -> tuple[int, int]:
+        """
+        Count corrected and correctly-suggested records one line at a time.
+
+        Returns:
+            Tuple of (total, correct)
+        """
         total = 0
         correct = 0
 
-        with open(self.results_file) as f:
+        with open(self.results_file, "rb") as f:
             for line in f:
-                result = json.loads(line)
+                # Most records are never corrected; skip them without parsing.
+                # Matches both our compact output and older spaced records.
+                if b'"actual_category":null' in line or b'"actual_category": null' in line:
+                    continue
+
+                result = _fast_json.loads(line)
                 if result["actual_category"] is not None:
                     total += 1
                     if result["suggested_category"] == result["actual_category"]:
                         correct += 1
 
-        accuracy = correct / total if total > 0 else 0.0
-
-        return {
-            "total": total,
-            "correct": correct,
-            "accuracy": accuracy,
-        }
+        return total, correct
 
     def export_training_data(self) -> Path:
         """
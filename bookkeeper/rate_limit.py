@@ -0,0 +1,64 @@
+"""Client-side rate limiting for concurrent API calls."""
+
+import asyncio
+import time
+
+
+class RateLimiter:
+    """Token-bucket limiter for requests per minute and tokens per minute."""
+
+    def __init__(self, requests_per_minute: float, tokens_per_minute: float):
+        """
+        Initialize rate limiter with full buckets.
+
+        Args:
+            requests_per_minute: Maximum requests allowed per minute
+            tokens_per_minute: Maximum tokens allowed per minute
+        """
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self._available_requests = requests_per_minute
+        self._available_tokens = tokens_per_minute
+        self._last_update = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        """Replenish both buckets for the time elapsed since the last refill."""
+        now = time.monotonic()
+        elapsed_minutes = (now - self._last_update) / 60
+        self._last_update = now
+
+        self._available_requests = min(
+            self.requests_per_minute,
+            self._available_requests + elapsed_minutes * self.requests_per_minute,
+        )
+        self._available_tokens = min(
+            self.tokens_per_minute,
+            self._available_tokens + elapsed_minutes * self.tokens_per_minute,
+        )
+
+    async def acquire(self, tokens: int) -> None:
+        """
+        Wait until capacity is available for one request of the given size.
+
+        Args:
+            tokens: Estimated tokens consumed by the request
+        """
+        # A request larger than the whole bucket would otherwise wait forever
+        tokens = min(tokens, self.tokens_per_minute)
+
+        # Callers queue on the lock so capacity is granted in arrival order
+        async with self._lock:
+            while True:
+                self._refill()
+                if self._available_requests >= 1 and self._available_tokens >= tokens:
+                    self._available_requests -= 1
+                    self._available_tokens -= tokens
+                    return
+
+                # Sleep just long enough for the scarcer bucket to refill
+                wait_minutes = max(
+                    (1 - self._available_requests) / self.requests_per_minute,
+                    (tokens - self._available_tokens) / self.tokens_per_minute,
+                )
+                await asyncio.sleep(wait_minutes * 60)
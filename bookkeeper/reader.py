@@ -1,7 +1,10 @@
 """Read transactions from Quicken SQLite database."""
 
+import functools
+import re
 import sqlite3
-from dataclasses import dataclass
+from collections.abc import Iterator
+from dataclasses import dataclass, field
 from datetime import date, datetime
 from pathlib import Path
 from typing import Optional
@@ -9,12 +12,45 @@ from typing import Optional
 # Core Data reference date (Jan 1, 2001 00:00:00 UTC)
 CORE_DATA_EPOCH = 978307200
 
-
+# Rows fetched from SQLite at a time while streaming transactions
+FETCH_BATCH_SIZE = 1000
+
+# Index we add for the transaction -> cashflow entry join if Quicken lacks one
+CASHFLOW_PARENT_INDEX = "bk_idx_cfte_parent"
+
+# Payee substituted when a transaction has none
+UNKNOWN_PAYEE = "Unknown"
+
+# Normalized payees that don't identify a merchant, e.g. "CHECK 1001" -> "check".
+# Transactions with these payees must not be assumed to share a category.
+GENERIC_PAYEES = frozenset({
+    "",
+    "unknown",
+    "check",
+    "deposit",
+    "mobile deposit",
+    "withdrawal",
+    "atm withdrawal",
+    "atm",
+    "transfer",
+    "online transfer",
+    "payment",
+    "debit",
+    "credit",
+    "pos purchase",
+    "purchase",
+    "cash",
+    "ach",
+})
+
+
+@functools.lru_cache(maxsize=8192)
 def core_data_timestamp_to_date(timestamp: float) -> date:
     """
     Convert Core Data timestamp to Python date.
 
-    Core Data uses seconds since Jan 1, 2001 (not Unix epoch).
+    Core Data uses seconds since Jan 1, 2001 (not Unix epoch). Memoized,
+    since many transactions share the same posted date.
 
     Args:
         timestamp: Core Data timestamp
@@ -22,11 +58,40 @@ def core_data_timestamp_to_date(timestamp: float) -> date:
     Returns:
         Python date object
     """
-    unix_timestamp = timestamp + CORE_DATA_EPOCH
-    return datetime.fromtimestamp(unix_timestamp).date()
+    return date.fromtimestamp(timestamp + CORE_DATA_EPOCH)
+
+
+def normalize_payee(payee: str) -> str:
+    """
+    Normalize a payee so recurring charges from the same merchant compare equal.
 
+    Lowercases, collapses punctuation to single spaces, and drops trailing
+    numeric tokens such as store or card numbers.
 
-@dataclass
+    Args:
+        payee: Raw payee string
+
+    Returns:
+        Normalized payee, e.g. "STARBUCKS #1234" -> "starbucks"
+    """
+    normalized = re.sub(r"[^a-z0-9]+", " ", payee.lower()).strip()
+    return re.sub(r"(?:\s+\d+)+$", "", normalized)
+
+
+def is_generic_payee(normalized_payee: str) -> bool:
+    """
+    Check whether a normalized payee is a placeholder rather than a merchant.
+
+    Args:
+        normalized_payee: Payee as returned by normalize_payee
+
+    Returns:
+        True for missing, numeric-only, or generic payees such as "check"
+    """
+    return normalized_payee in GENERIC_PAYEES or normalized_payee.isdigit()
+
+
+@dataclass(slots=True)
 class Transaction:
     """Represents a single transaction from Quicken."""
 
@@ -43,22 +108,99 @@ class Transaction:
     fi_note: Optional[str]  # Last 4 digits of card/account from bank
     reference: Optional[str]
     check_number: Optional[str]
-    # Store all raw data for ML/LLM classification
-    raw_data: dict
+    # Derived once from payee; used for cache keys and deduplication
+    normalized_payee: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.normalized_payee = normalize_payee(self.payee)
 
 
 class QuickenReader:
     """Reads transactions from Quicken SQLite database."""
 
-    def __init__(self, quicken_file: Path):
+    def __init__(self, quicken_file: Path, read_only: bool = True):
         """
         Initialize reader for a Quicken file.
 
         Args:
             quicken_file: Path to .quicken file (package containing SQLite DB)
+            read_only: Open the database read-only (default). Pass False to let
+                       the reader add a missing join index on first use; only do
+                       so once the file has been backed up.
         """
         self.quicken_file = quicken_file
+        self.read_only = read_only
         self.db_path = self._find_database(quicken_file)
+        self._connection: Optional[sqlite3.Connection] = None
+
+    def __enter__(self) -> "QuickenReader":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def _conn(self) -> sqlite3.Connection:
+        """
+        Get the database connection, opening it on first use.
+
+        Returns:
+            Connection shared by all queries of this reader
+        """
+        if self._connection is None:
+            if self.read_only:
+                # mode=ro makes SQLite itself refuse any write to the user's file
+                self._connection = sqlite3.connect(
+                    f"{self.db_path.resolve().as_uri()}?mode=ro",
+                    uri=True,
+                    check_same_thread=False,
+                )
+            else:
+                self._connection = sqlite3.connect(self.db_path, check_same_thread=False)
+                self._ensure_parent_index(self._connection)
+            self._connection.row_factory = sqlite3.Row
+
+            # Tune for large sequential scans: memory-map up to 256 MiB of the file,
+            # use a 64 MiB page cache, and keep temp b-trees in memory. These only
+            # affect this connection, not the file Quicken opens.
+            self._connection.execute("PRAGMA mmap_size = 268435456")
+            self._connection.execute("PRAGMA cache_size = -65536")
+            self._connection.execute("PRAGMA temp_store = MEMORY")
+        return self._connection
+
+    def close(self) -> None:
+        """Close the database connection, if open."""
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    @staticmethod
+    def _ensure_parent_index(conn: sqlite3.Connection) -> None:
+        """
+        Index ZCASHFLOWTRANSACTIONENTRY(ZPARENT) unless an index already leads with it.
+
+        Without one, every transaction in read_transactions scans the whole
+        cashflow entry table to find its category.
+
+        Args:
+            conn: Writable database connection
+        """
+        try:
+            for index in conn.execute(
+                "PRAGMA index_list(ZCASHFLOWTRANSACTIONENTRY)"
+            ).fetchall():
+                # index_info rows are (seqno, cid, name); the first is the leading column
+                first_column = conn.execute(f'PRAGMA index_info("{index[1]}")').fetchone()
+                if first_column is not None and first_column[2] == "ZPARENT":
+                    return
+
+            conn.execute(
+                f"CREATE INDEX IF NOT EXISTS {CASHFLOW_PARENT_INDEX} "
+                "ON ZCASHFLOWTRANSACTIONENTRY(ZPARENT)"
+            )
+            conn.commit()
+        except sqlite3.OperationalError:
+            # File locked or not writable; reads still work, just without the index
+            pass
 
     def _find_database(self, quicken_file: Path) -> Path:
         """
@@ -84,6 +226,7 @@ class QuickenReader:
         start_date: Optional[date] = None,
         end_date: Optional[date] = None,
         account_types: Optional[list[str]] = None,
+        only_uncategorized: bool = False,
     ) -> list[Transaction]:
         """
         Read transactions from the database.
@@ -93,83 +236,111 @@ class QuickenReader:
             end_date: Optional end date filter
             account_types: Optional list of account types to include
                           (e.g., ['CHECKING', 'CREDITCARD'])
+            only_uncategorized: Only include transactions with no category,
+                                an empty one, or "Uncategorized"
 
         Returns:
             List of Transaction objects
         """
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
+        return list(self.iter_transactions(
+            start_date, end_date, account_types, only_uncategorized
+        ))
 
-        try:
-            # Join transactions with payees, categories, and accounts
-            query = """
-                SELECT
-                    t.Z_PK as id,
-                    t.ZENTEREDDATE as entered_date,
-                    t.ZPOSTEDDATE as posted_date,
-                    t.ZAMOUNT as amount,
-                    t.ZNOTE as note,
-                    t.ZFINOTE as fi_note,
-                    t.ZREFERENCE as reference,
-                    t.ZCHECKNUMBER as check_number,
-                    t.ZACCOUNT as account_id,
-                    p.ZNAME as payee_name,
-                    c.ZNAME as category_name,
-                    cfte.Z_PK as cashflow_entry_id,
-                    a.ZNAME as account_name,
-                    a.ZTYPENAME as account_type
-                FROM ZTRANSACTION t
-                LEFT JOIN ZUSERPAYEE p ON t.ZUSERPAYEE = p.Z_PK
-                LEFT JOIN ZCASHFLOWTRANSACTIONENTRY cfte ON cfte.ZPARENT = t.Z_PK
-                LEFT JOIN ZTAG c ON cfte.ZCATEGORYTAG = c.Z_PK
-                LEFT JOIN ZACCOUNT a ON t.ZACCOUNT = a.Z_PK
-                WHERE t.ZAMOUNT IS NOT NULL
-            """
-            params = []
-
-            # Build filters
-            conditions = []
-
-            # Account type filter
-            if account_types:
-                placeholders = ",".join(["?" for _ in account_types])
-                conditions.append(f"a.ZTYPENAME IN ({placeholders})")
-                params.extend(account_types)
-            # Date filters
-            if start_date:
-                # Convert Python date to Core Data timestamp
-                start_dt = datetime.combine(start_date, datetime.min.time())
-                start_timestamp = start_dt.timestamp() - CORE_DATA_EPOCH
-                conditions.append("t.ZENTEREDDATE >= ?")
-                params.append(start_timestamp)
-
-            if end_date:
-                # Convert Python date to Core Data timestamp
-                end_dt = datetime.combine(end_date, datetime.max.time())
-                end_timestamp = end_dt.timestamp() - CORE_DATA_EPOCH
-                conditions.append("t.ZENTEREDDATE <= ?")
-                params.append(end_timestamp)
-
-            # Apply all conditions
-            if conditions:
-                query += " AND " + " AND ".join(conditions)
-
-            query += " ORDER BY t.ZENTEREDDATE DESC"
-
-            cursor = conn.execute(query, params)
-            rows = cursor.fetchall()
-
-            # Convert to Transaction objects
-            transactions = []
+    def iter_transactions(
+        self,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        account_types: Optional[list[str]] = None,
+        only_uncategorized: bool = False,
+    ) -> Iterator[Transaction]:
+        """
+        Stream transactions from the database, FETCH_BATCH_SIZE rows at a time.
+
+        Args:
+            start_date: Optional start date filter
+            end_date: Optional end date filter
+            account_types: Optional list of account types to include
+                          (e.g., ['CHECKING', 'CREDITCARD'])
+            only_uncategorized: Only include transactions with no category,
+                                an empty one, or "Uncategorized"
+
+        Yields:
+            Transaction objects, newest first
+        """
+        conn = self._conn()
+
+        # Join transactions with payees, categories, and accounts
+        query = """
+            SELECT
+                t.Z_PK as id,
+                t.ZENTEREDDATE as entered_date,
+                t.ZPOSTEDDATE as posted_date,
+                t.ZAMOUNT as amount,
+                t.ZNOTE as note,
+                t.ZFINOTE as fi_note,
+                t.ZREFERENCE as reference,
+                t.ZCHECKNUMBER as check_number,
+                t.ZACCOUNT as account_id,
+                p.ZNAME as payee_name,
+                c.ZNAME as category_name,
+                cfte.Z_PK as cashflow_entry_id,
+                a.ZNAME as account_name,
+                a.ZTYPENAME as account_type
+            FROM ZTRANSACTION t
+            LEFT JOIN ZUSERPAYEE p ON t.ZUSERPAYEE = p.Z_PK
+            LEFT JOIN ZCASHFLOWTRANSACTIONENTRY cfte ON cfte.ZPARENT = t.Z_PK
+            LEFT JOIN ZTAG c ON cfte.ZCATEGORYTAG = c.Z_PK
+            LEFT JOIN ZACCOUNT a ON t.ZACCOUNT = a.Z_PK
+            WHERE t.ZAMOUNT IS NOT NULL
+        """
+        params = []
+
+        # Build filters
+        conditions = []
+
+        # Account type filter
+        if account_types:
+            placeholders = ",".join(["?" for _ in account_types])
+            conditions.append(f"a.ZTYPENAME IN ({placeholders})")
+            params.extend(account_types)
+        # Date filters
+        if start_date:
+            # Convert Python date to Core Data timestamp
+            start_dt = datetime.combine(start_date, datetime.min.time())
+            start_timestamp = start_dt.timestamp() - CORE_DATA_EPOCH
+            conditions.append("t.ZENTEREDDATE >= ?")
+            params.append(start_timestamp)
+
+        if end_date:
+            # Convert Python date to Core Data timestamp
+            end_dt = datetime.combine(end_date, datetime.max.time())
+            end_timestamp = end_dt.timestamp() - CORE_DATA_EPOCH
+            conditions.append("t.ZENTEREDDATE <= ?")
+            params.append(end_timestamp)
+
+        # Category filter, evaluated by SQLite so categorized rows never reach Python
+        if only_uncategorized:
+            conditions.append("(c.ZNAME IS NULL OR c.ZNAME IN ('', 'Uncategorized'))")
+
+        # Apply all conditions
+        if conditions:
+            query += " AND " + " AND ".join(conditions)
+
+        query += " ORDER BY t.ZENTEREDDATE DESC"
+
+        cursor = conn.execute(query, params)
+
+        # Convert to Transaction objects a batch at a time
+        while rows := cursor.fetchmany(FETCH_BATCH_SIZE):
             for row in rows:
                 # Use posted date if available, otherwise entered date
                 timestamp = row["posted_date"] if row["posted_date"] else row["entered_date"]
                 trans_date = core_data_timestamp_to_date(timestamp) if timestamp else date.today()
 
-                transactions.append(Transaction(
+                yield Transaction(
                     id=row["id"],
                     date=trans_date,
-                    payee=row["payee_name"] or "Unknown",
+                    payee=row["payee_name"] or UNKNOWN_PAYEE,
                     amount=row["amount"],
                     category=row["category_name"],
                     memo=row["note"],
@@ -179,13 +350,7 @@ class QuickenReader:
                     fi_note=row["fi_note"],
                     reference=row["reference"],
                     check_number=row["check_number"],
-                    raw_data=dict(row),
-                ))
-
-            return transactions
-
-        finally:
-            conn.close()
+                )
 
     def get_all_categories(self) -> list[str]:
         """
@@ -194,14 +359,10 @@ class QuickenReader:
         Returns:
             List of category names
         """
-        conn = sqlite3.connect(self.db_path)
-        try:
-            cursor = conn.execute(
-                "SELECT ZNAME FROM ZTAG WHERE ZUSERASSIGNABLE = 1 ORDER BY ZNAME"
-            )
-            return [row[0] for row in cursor.fetchall()]
-        finally:
-            conn.close()
+        cursor = self._conn().execute(
+            "SELECT ZNAME FROM ZTAG WHERE ZUSERASSIGNABLE = 1 ORDER BY ZNAME"
+        )
+        return [row[0] for row in cursor.fetchall()]
 
     def get_all_accounts(self) -> dict[str, list[str]]:
         """
@@ -210,26 +371,22 @@ class QuickenReader:
         Returns:
             Dictionary mapping account type -> list of account names
         """
-        conn = sqlite3.connect(self.db_path)
-        try:
-            cursor = conn.execute(
-                """
-                SELECT ZTYPENAME, ZNAME
-                FROM ZACCOUNT
-                WHERE ZTYPENAME IS NOT NULL
-                ORDER BY ZTYPENAME, ZNAME
-                """
-            )
+        cursor = self._conn().execute(
+            """
+            SELECT ZTYPENAME, ZNAME
+            FROM ZACCOUNT
+            WHERE ZTYPENAME IS NOT NULL
+            ORDER BY ZTYPENAME, ZNAME
+            """
+        )
 
-            accounts_by_type = {}
-            for row in cursor.fetchall():
-                account_type = row[0]
-                account_name = row[1]
+        accounts_by_type = {}
+        for row in cursor.fetchall():
+            account_type = row[0]
+            account_name = row[1]
 
-                if account_type not in accounts_by_type:
-                    accounts_by_type[account_type] = []
-                accounts_by_type[account_type].append(account_name)
+            if account_type not in accounts_by_type:
+                accounts_by_type[account_type] = []
+            accounts_by_type[account_type].append(account_name)
 
-            return accounts_by_type
-        finally:
-            conn.close()
+        return accounts_by_type
@@ -1,10 +1,69 @@
 """Write category updates back to Quicken SQLite database."""
 
 import sqlite3
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
+# Core Data entity number for ZCASHFLOWTRANSACTIONENTRY rows
+CASHFLOW_ENTRY_ENT = 80
+
+# SQL reused on every call; shared string objects keep statement-cache lookups cheap
+_SQL_GET_CATEGORY_ID = "SELECT Z_PK FROM ZTAG WHERE ZNAME = ? AND ZUSERASSIGNABLE = 1"
+_SQL_GET_ENTRY = "SELECT Z_PK FROM ZCASHFLOWTRANSACTIONENTRY WHERE ZPARENT = ?"
+_SQL_GET_AMOUNT = "SELECT ZAMOUNT FROM ZTRANSACTION WHERE Z_PK = ?"
+_SQL_MAX_ENTRY_PK = "SELECT MAX(Z_PK) FROM ZCASHFLOWTRANSACTIONENTRY"
+_SQL_GET_MAX_PK = "SELECT Z_MAX FROM Z_PRIMARYKEY WHERE Z_ENT = ?"
+_SQL_SET_MAX_PK = "UPDATE Z_PRIMARYKEY SET Z_MAX = ? WHERE Z_ENT = ?"
+_SQL_INSERT_ENTRY = f"""
+    INSERT INTO ZCASHFLOWTRANSACTIONENTRY
+    (Z_PK, Z_ENT, Z_OPT, ZPARENT, ZAMOUNT, ZSEQUENCENUMBER)
+    VALUES (?, {CASHFLOW_ENTRY_ENT}, 1, ?, ?, 0)
+"""
+_SQL_SET_CATEGORY = "UPDATE ZCASHFLOWTRANSACTIONENTRY SET ZCATEGORYTAG = ? WHERE Z_PK = ?"
+
+# Batch updates are staged in a temp table and applied by SQLite in a few statements.
+# Lookups pick the lowest Z_PK, matching the first row the single-update path sees.
+_SQL_CREATE_BATCH = "CREATE TEMP TABLE bk_upd (txn INTEGER PRIMARY KEY, cat TEXT NOT NULL)"
+_SQL_FILL_BATCH = "INSERT OR REPLACE INTO bk_upd (txn, cat) VALUES (?, ?)"
+_SQL_DROP_BATCH = "DROP TABLE IF EXISTS temp.bk_upd"
+_SQL_BATCH_VALID = """
+    EXISTS (SELECT 1 FROM ZTAG c WHERE c.ZNAME = u.cat AND c.ZUSERASSIGNABLE = 1)
+"""
+_SQL_BATCH_MISSING = f"""
+    FROM bk_upd u
+    WHERE {_SQL_BATCH_VALID}
+      AND NOT EXISTS (SELECT 1 FROM ZCASHFLOWTRANSACTIONENTRY e WHERE e.ZPARENT = u.txn)
+"""
+_SQL_COUNT_MISSING = f"SELECT COUNT(*) {_SQL_BATCH_MISSING}"
+_SQL_INSERT_MISSING = f"""
+    INSERT INTO ZCASHFLOWTRANSACTIONENTRY
+    (Z_PK, Z_ENT, Z_OPT, ZPARENT, ZAMOUNT, ZSEQUENCENUMBER)
+    SELECT
+        ? + ROW_NUMBER() OVER (ORDER BY u.txn) - 1,
+        {CASHFLOW_ENTRY_ENT}, 1, u.txn,
+        COALESCE((SELECT t.ZAMOUNT FROM ZTRANSACTION t WHERE t.Z_PK = u.txn), 0),
+        0
+    {_SQL_BATCH_MISSING}
+"""
+_SQL_APPLY_BATCH = f"""
+    UPDATE ZCASHFLOWTRANSACTIONENTRY
+    SET ZCATEGORYTAG = (
+        SELECT MIN(c.Z_PK)
+        FROM bk_upd u JOIN ZTAG c ON c.ZNAME = u.cat AND c.ZUSERASSIGNABLE = 1
+        WHERE u.txn = ZCASHFLOWTRANSACTIONENTRY.ZPARENT
+    )
+    WHERE Z_PK IN (
+        SELECT MIN(e.Z_PK)
+        FROM ZCASHFLOWTRANSACTIONENTRY e JOIN bk_upd u ON u.txn = e.ZPARENT
+        WHERE {_SQL_BATCH_VALID}
+        GROUP BY e.ZPARENT
+    )
+"""
+_SQL_BATCH_RESULTS = f"SELECT u.txn, {_SQL_BATCH_VALID} FROM bk_upd u"
+
 
 class QuickenWriter:
     """Writes category updates to Quicken SQLite database."""
@@ -17,10 +76,63 @@ class QuickenWriter:
             db_path: Path to SQLite database file
         """
         self.db_path = db_path
+        self._connection: Optional[sqlite3.Connection] = None
+        # Category name -> Z_PK (or None) for this connection's lifetime
+        self._cat_cache: dict[str, Optional[int]] = {}
+
+    def __enter__(self) -> "QuickenWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def _conn(self) -> sqlite3.Connection:
+        """
+        Get the database connection, opening it on first use.
+
+        Returns:
+            Connection shared by all updates of this writer
+        """
+        if self._connection is None:
+            # Autocommit mode: transactions are opened explicitly by _transaction()
+            self._connection = sqlite3.connect(
+                self.db_path, isolation_level=None, cached_statements=256
+            )
+        return self._connection
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """
+        Run a block as one write transaction with a single commit.
+
+        BEGIN IMMEDIATE takes the write lock up front, so a concurrent writer
+        fails here rather than partway through the updates.
+
+        Yields:
+            Connection inside the open transaction
+        """
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+            conn.execute("COMMIT")
+        except BaseException:
+            # A failed COMMIT (e.g. a reader still holds the lock) leaves the
+            # transaction open; SQLite may also have rolled back on its own already
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+
+    def close(self) -> None:
+        """Close the database connection, if open."""
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+        self._cat_cache.clear()
 
     def _get_category_id(self, conn: sqlite3.Connection, category_name: str) -> Optional[int]:
         """
-        Get the Z_PK for a category by name.
+        Get the Z_PK for a category by name, memoized per writer session.
 
         Args:
             conn: Database connection
@@ -29,12 +141,43 @@ class QuickenWriter:
         Returns:
             Category ID (Z_PK) or None if not found
         """
-        cursor = conn.execute(
-            "SELECT Z_PK FROM ZTAG WHERE ZNAME = ? AND ZUSERASSIGNABLE = 1",
-            (category_name,)
-        )
-        row = cursor.fetchone()
-        return row[0] if row else None
+        if category_name not in self._cat_cache:
+            cursor = conn.execute(_SQL_GET_CATEGORY_ID, (category_name,))
+            row = cursor.fetchone()
+            self._cat_cache[category_name] = row[0] if row else None
+        return self._cat_cache[category_name]
+
+    def _allocate_pks(self, conn: sqlite3.Connection, count: int) -> int:
+        """
+        Reserve a contiguous range of Z_PKs for new cashflow entries.
+
+        Core Data tracks the last key it handed out per entity in Z_PRIMARYKEY;
+        bumping Z_MAX keeps Quicken from reusing the keys we insert. MAX(Z_PK)
+        is also consulted because earlier versions inserted without bumping it.
+
+        Args:
+            conn: Database connection (inside the write transaction)
+            count: Number of keys to reserve
+
+        Returns:
+            First reserved Z_PK
+        """
+        # Z_PK is the rowid, so MAX() is a single b-tree seek
+        cursor = conn.execute(_SQL_MAX_ENTRY_PK)
+        max_pk = cursor.fetchone()[0] or 0
+
+        try:
+            row = conn.execute(_SQL_GET_MAX_PK, (CASHFLOW_ENTRY_ENT,)).fetchone()
+        except sqlite3.OperationalError:
+            # Not a Core Data store; MAX(Z_PK) alone is authoritative
+            row = None
+
+        if row is None:
+            return max_pk + 1
+
+        first_pk = max(max_pk, row[0] or 0) + 1
+        conn.execute(_SQL_SET_MAX_PK, (first_pk + count - 1, CASHFLOW_ENTRY_ENT))
+        return first_pk
 
     def _get_or_create_cashflow_entry(
         self, conn: sqlite3.Connection, transaction_id: int
@@ -50,10 +193,7 @@ class QuickenWriter:
             Cashflow entry Z_PK
         """
         # Check if cashflow entry already exists
-        cursor = conn.execute(
-            "SELECT Z_PK FROM ZCASHFLOWTRANSACTIONENTRY WHERE ZPARENT = ?",
-            (transaction_id,)
-        )
+        cursor = conn.execute(_SQL_GET_ENTRY, (transaction_id,))
         row = cursor.fetchone()
 
         if row:
@@ -61,26 +201,14 @@ class QuickenWriter:
 
         # Create new cashflow entry
         # Get the transaction amount for the entry
-        cursor = conn.execute(
-            "SELECT ZAMOUNT FROM ZTRANSACTION WHERE Z_PK = ?", (transaction_id,)
-        )
+        cursor = conn.execute(_SQL_GET_AMOUNT, (transaction_id,))
         amount_row = cursor.fetchone()
         amount = amount_row[0] if amount_row else 0
 
-        # Get next Z_PK for cashflow entry table
-        cursor = conn.execute("SELECT MAX(Z_PK) FROM ZCASHFLOWTRANSACTIONENTRY")
-        max_pk = cursor.fetchone()[0] or 0
-        new_pk = max_pk + 1
+        new_pk = self._allocate_pks(conn, 1)
 
         # Insert new cashflow entry
-        conn.execute(
-            """
-            INSERT INTO ZCASHFLOWTRANSACTIONENTRY
-            (Z_PK, Z_ENT, Z_OPT, ZPARENT, ZAMOUNT, ZSEQUENCENUMBER)
-            VALUES (?, 80, 1, ?, ?, 0)
-            """,
-            (new_pk, transaction_id, amount)
-        )
+        conn.execute(_SQL_INSERT_ENTRY, (new_pk, transaction_id, amount))
 
         return new_pk
 
@@ -95,8 +223,7 @@ class QuickenWriter:
         Returns:
             True if successful, False if category not found
         """
-        conn = sqlite3.connect(self.db_path)
-        try:
+        with self._transaction() as conn:
             # Get category ID
             category_id = self._get_category_id(conn, category_name)
             if category_id is None:
@@ -106,16 +233,9 @@ class QuickenWriter:
             cashflow_entry_id = self._get_or_create_cashflow_entry(conn, transaction_id)
 
             # Update the category
-            conn.execute(
-                "UPDATE ZCASHFLOWTRANSACTIONENTRY SET ZCATEGORYTAG = ? WHERE Z_PK = ?",
-                (category_id, cashflow_entry_id)
-            )
+            conn.execute(_SQL_SET_CATEGORY, (category_id, cashflow_entry_id))
 
-            conn.commit()
-            return True
-
-        finally:
-            conn.close()
+        return True
 
     def update_categories(self, updates: dict[int, str]) -> dict[int, bool]:
         """
@@ -127,30 +247,40 @@ class QuickenWriter:
         Returns:
             Dictionary mapping transaction_id -> success status
         """
-        conn = sqlite3.connect(self.db_path)
-        results = {}
+        return self.update_categories_batch(updates.items())
 
-        try:
-            for transaction_id, category_name in updates.items():
-                # Get category ID
-                category_id = self._get_category_id(conn, category_name)
-                if category_id is None:
-                    results[transaction_id] = False
-                    continue
+    def update_categories_batch(self, updates: Iterable[tuple[int, str]]) -> dict[int, bool]:
+        """
+        Batch update categories from a stream of (transaction_id, category_name) pairs.
 
-                # Get or create cashflow entry
-                cashflow_entry_id = self._get_or_create_cashflow_entry(conn, transaction_id)
+        The pairs are fed straight to executemany, so callers needn't build a dict.
+        If a transaction appears more than once, the last pair wins.
+
+        Args:
+            updates: Iterable of (transaction_id, new_category_name) tuples
 
-                # Update the category
-                conn.execute(
-                    "UPDATE ZCASHFLOWTRANSACTIONENTRY SET ZCATEGORYTAG = ? WHERE Z_PK = ?",
-                    (category_id, cashflow_entry_id)
-                )
+        Returns:
+            Dictionary mapping transaction_id -> success status
+        """
+        conn = self._conn()
+        conn.execute(_SQL_CREATE_BATCH)
+        try:
+            with self._transaction():
+                conn.executemany(_SQL_FILL_BATCH, updates)
 
-                results[transaction_id] = True
+                # Create cashflow entries for transactions that have none,
+                # carrying over the transaction amount
+                missing = conn.execute(_SQL_COUNT_MISSING).fetchone()[0]
+                if missing:
+                    conn.execute(_SQL_INSERT_MISSING, (self._allocate_pks(conn, missing),))
 
-            conn.commit()
-            return results
+                conn.execute(_SQL_APPLY_BATCH)
 
+                results = {
+                    transaction_id: bool(found)
+                    for transaction_id, found in conn.execute(_SQL_BATCH_RESULTS)
+                }
         finally:
-            conn.close()
+            conn.execute(_SQL_DROP_BATCH)
+
+        return results
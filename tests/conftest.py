@@ -0,0 +1,61 @@
+"""Shared fixtures for Bookkeeper tests."""
+
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+# Minimal subset of Quicken's Core Data schema used by the reader and writer
+SCHEMA = """
+CREATE TABLE ZTRANSACTION (
+    Z_PK INTEGER PRIMARY KEY, ZENTEREDDATE REAL, ZPOSTEDDATE REAL, ZAMOUNT REAL,
+    ZNOTE TEXT, ZFINOTE TEXT, ZREFERENCE TEXT, ZCHECKNUMBER TEXT,
+    ZACCOUNT INTEGER, ZUSERPAYEE INTEGER
+);
+CREATE TABLE ZUSERPAYEE (Z_PK INTEGER PRIMARY KEY, ZNAME TEXT);
+CREATE TABLE ZTAG (Z_PK INTEGER PRIMARY KEY, ZNAME TEXT, ZUSERASSIGNABLE INTEGER);
+CREATE TABLE ZACCOUNT (Z_PK INTEGER PRIMARY KEY, ZNAME TEXT, ZTYPENAME TEXT, ZACTIVE INTEGER);
+CREATE TABLE ZCASHFLOWTRANSACTIONENTRY (
+    Z_PK INTEGER PRIMARY KEY, Z_ENT INTEGER, Z_OPT INTEGER, ZPARENT INTEGER,
+    ZAMOUNT REAL, ZSEQUENCENUMBER INTEGER, ZCATEGORYTAG INTEGER
+);
+CREATE INDEX ZCASHFLOWTRANSACTIONENTRY_ZPARENT_INDEX ON ZCASHFLOWTRANSACTIONENTRY (ZPARENT);
+CREATE TABLE Z_PRIMARYKEY (Z_ENT INTEGER PRIMARY KEY, Z_NAME VARCHAR, Z_SUPER INTEGER, Z_MAX INTEGER);
+"""
+
+
+@pytest.fixture
+def quicken_file(tmp_path: Path) -> Path:
+    """
+    Build a small .quicken package.
+
+    Categories: 1 Groceries, 2 Dining, 3 Hidden (not assignable), 4 Groceries (duplicate name).
+    Transactions: 1 has one uncategorized entry, 2 and 4 have no entry,
+    3 is split across entries 2 and 3. Z_PRIMARYKEY.Z_MAX is ahead of MAX(Z_PK).
+    """
+    package = tmp_path / "Test.quicken"
+    package.mkdir()
+
+    conn = sqlite3.connect(package / "data")
+    conn.executescript(SCHEMA)
+    conn.executemany(
+        "INSERT INTO ZTAG VALUES (?, ?, ?)",
+        [(1, "Groceries", 1), (2, "Dining", 1), (3, "Hidden", 0), (4, "Groceries", 1)],
+    )
+    conn.execute("INSERT INTO ZACCOUNT VALUES (1, 'Checking', 'CHECKING', 1)")
+    conn.execute("INSERT INTO ZUSERPAYEE VALUES (1, 'SAFEWAY #1234')")
+    conn.executemany(
+        "INSERT INTO ZTRANSACTION (Z_PK, ZENTEREDDATE, ZAMOUNT, ZACCOUNT, ZUSERPAYEE)"
+        " VALUES (?, ?, ?, 1, 1)",
+        [(1, 7e8, -10.0), (2, 7e8 + 86400, -20.0), (3, 7e8 + 2 * 86400, -30.0),
+         (4, 7e8 + 3 * 86400, -40.0)],
+    )
+    conn.executemany(
+        "INSERT INTO ZCASHFLOWTRANSACTIONENTRY VALUES (?, 80, 1, ?, ?, ?, NULL)",
+        [(1, 1, -10.0, 0), (2, 3, -12.0, 0), (3, 3, -18.0, 1)],
+    )
+    conn.execute("INSERT INTO Z_PRIMARYKEY VALUES (80, 'CashFlowTransactionEntry', 0, 10)")
+    conn.commit()
+    conn.close()
+
+    return package
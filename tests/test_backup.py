@@ -0,0 +1,77 @@
+"""Tests for copy-on-write backups of Quicken packages."""
+
+import ctypes
+import errno
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+from bookkeeper import backup
+from bookkeeper.backup import create_backup
+
+
+@pytest.fixture(autouse=True)
+def reset_clone_support(monkeypatch):
+    """Start each test with cloning assumed to be supported."""
+    monkeypatch.setattr(backup, "_clonefile_supported", True)
+    monkeypatch.setattr(backup, "_ficlone_supported", True)
+
+
+def make_package(tmp_path: Path) -> Path:
+    package = tmp_path / "Test.quicken"
+    (package / "attachments").mkdir(parents=True)
+    (package / "data").write_bytes(b"sqlite" * 100)
+    for index in range(3):
+        (package / "attachments" / f"receipt{index}.pdf").write_bytes(bytes([index]) * 10)
+    os.symlink("data", package / "data-link")
+    return package
+
+
+def test_backup_copies_package_tree(tmp_path):
+    package = make_package(tmp_path)
+
+    backup_path = create_backup(package, tmp_path / "backups")
+
+    assert backup_path.name.startswith("Test_backup_")
+    assert backup_path.suffix == ".quicken"
+    assert (backup_path / "data").read_bytes() == b"sqlite" * 100
+    assert (backup_path / "attachments" / "receipt2.pdf").read_bytes() == b"\x02" * 10
+    assert os.readlink(backup_path / "data-link") == "data"
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="FICLONE is Linux-only")
+def test_ficlone_not_retried_after_unsupported_error(tmp_path, monkeypatch):
+    import fcntl
+
+    calls = []
+
+    def unsupported_ioctl(*args):
+        calls.append(args)
+        raise OSError(errno.EOPNOTSUPP, "Operation not supported")
+
+    monkeypatch.setattr(fcntl, "ioctl", unsupported_ioctl)
+
+    backup_path = create_backup(make_package(tmp_path), tmp_path / "backups")
+
+    assert len(calls) == 1
+    assert (backup_path / "attachments" / "receipt1.pdf").read_bytes() == b"\x01" * 10
+
+
+def test_clonefile_not_retried_after_unsupported_error(tmp_path, monkeypatch):
+    calls = []
+
+    def cross_device_clonefile(src, dst, flags):
+        calls.append(src)
+        ctypes.set_errno(errno.EXDEV)
+        return -1
+
+    monkeypatch.setattr(sys, "platform", "darwin")
+    monkeypatch.setattr(backup, "_load_clonefile", lambda: cross_device_clonefile)
+
+    backup_path = create_backup(make_package(tmp_path), tmp_path / "backups")
+
+    # Only the whole-tree attempt; the per-file walk copies without retrying
+    assert len(calls) == 1
+    assert (backup_path / "data").read_bytes() == b"sqlite" * 100
@@ -0,0 +1,109 @@
+"""Tests for the persistent classification cache."""
+
+import sqlite3
+from datetime import date
+from pathlib import Path
+
+import pytest
+
+from bookkeeper.cache import ClassificationCache, amount_bucket
+from bookkeeper.classifier import TransactionClassifier
+from bookkeeper.reader import Transaction
+
+CATEGORIES = ["Groceries", "Dining"]
+
+
+def make_transaction(payee: str, amount: float = -25.0) -> Transaction:
+    """Build a checking-account transaction with the given payee and amount."""
+    return Transaction(
+        id=1,
+        date=date(2024, 1, 15),
+        payee=payee,
+        amount=amount,
+        category=None,
+        memo=None,
+        account_id=1,
+        account_name="Checking",
+        account_type="CHECKING",
+        fi_note=None,
+        reference=None,
+        check_number=None,
+    )
+
+
+def stored_keys(db_path: Path) -> list[str]:
+    conn = sqlite3.connect(db_path)
+    try:
+        return [row[0] for row in conn.execute("SELECT key FROM classifications")]
+    finally:
+        conn.close()
+
+
+@pytest.fixture
+def cache(tmp_path: Path):
+    cache = ClassificationCache(tmp_path / "cache.db")
+    yield cache
+    cache.close()
+
+
+@pytest.mark.parametrize(
+    ("amount", "bucket"),
+    [
+        (-0.5, "-0"),
+        (0.0, "+0"),
+        (9.99, "+0"),
+        (10.0, "+1"),
+        (-12.5, "-1"),
+        (250.0, "+2"),
+    ],
+)
+def test_amount_bucket(amount, bucket):
+    assert amount_bucket(amount) == bucket
+
+
+def test_round_trip_persists_across_instances(cache):
+    transaction = make_transaction("Blue Heron Cafe")
+    cache.set(transaction, "Dining", 0.9)
+    cache.close()
+
+    reopened = ClassificationCache(cache.db_path)
+    try:
+        # Same merchant and bucket, different store number and amount
+        assert reopened.get(make_transaction("BLUE HERON CAFE #7", -40.0)) == ("Dining", 0.9)
+        assert reopened.get(make_transaction("Blue Heron Cafe", -400.0)) is None
+    finally:
+        reopened.close()
+
+
+@pytest.mark.parametrize("payee", ["CHECK 1001", "Unknown", "12345"])
+def test_generic_payees_are_never_read_or_written(cache, payee):
+    transaction = make_transaction(payee)
+
+    cache.set(transaction, "Dining", 0.9)
+    assert stored_keys(cache.db_path) == []
+
+    # Even a row left under the key by an older version is ignored
+    cache.conn.execute(
+        "INSERT INTO classifications VALUES (?, 'Dining', 0.9, 0)", (cache.key(transaction),)
+    )
+    cache.conn.commit()
+    assert cache.get(transaction) is None
+
+
+def test_set_after_cached_miss_updates_memo(cache):
+    transaction = make_transaction("Blue Heron Cafe")
+
+    assert cache.get(transaction) is None
+    cache.set(transaction, "Dining", 0.8)
+
+    assert cache.get(transaction) == ("Dining", 0.8)
+
+
+def test_stale_category_hit_is_ignored(tmp_path):
+    with TransactionClassifier(cache_path=tmp_path / "cache.db") as classifier:
+        classifier.cache.set(make_transaction("Blue Heron Cafe"), "Coffee Shops", 0.9)
+        classifier.cache.set(make_transaction("Corner Deli"), "Dining", 0.9)
+
+        # Only hits on a category still offered are used
+        assert classifier._classify_locally(make_transaction("Blue Heron Cafe"), CATEGORIES) is None
+        assert classifier._classify_locally(make_transaction("Corner Deli"), CATEGORIES) == ("Dining", 0.9)
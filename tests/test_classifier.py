@@ -0,0 +1,249 @@
+"""Tests for rule matching and LLM response parsing in the classifier."""
+
+import asyncio
+from contextlib import asynccontextmanager, contextmanager
+from datetime import date
+from types import SimpleNamespace
+
+import pytest
+
+from bookkeeper import classifier as classifier_module
+from bookkeeper.classifier import TransactionClassifier
+from bookkeeper.reader import Transaction
+
+CATEGORIES = ["Groceries", "Dining", "Gas & Fuel"]
+
+
+def make_transaction(payee: str, transaction_id: int = 1) -> Transaction:
+    """Build a checking-account debit with the given payee."""
+    return Transaction(
+        id=transaction_id,
+        date=date(2024, 1, 15),
+        payee=payee,
+        amount=-25.0,
+        category=None,
+        memo=None,
+        account_id=1,
+        account_name="Checking",
+        account_type="CHECKING",
+        fi_note=None,
+        reference=None,
+        check_number=None,
+    )
+
+
+@pytest.fixture
+def classifier() -> TransactionClassifier:
+    return TransactionClassifier(cache_path=None)
+
+
+def use_rules(classifier: TransactionClassifier, rules: dict[str, str]) -> None:
+    """Replace the classifier's rules, rebuilding both matchers."""
+    classifier.rules = rules
+    classifier._automaton = classifier._build_automaton(rules)
+    classifier._rule_re = classifier._build_rule_regex(rules)
+    classifier._rule_map = {pattern.lower(): category for pattern, category in rules.items()}
+
+
+def apply_rules_both_ways(
+    classifier: TransactionClassifier, payee: str
+) -> tuple[object, object]:
+    """Return (automaton result, regex result) for a payee."""
+    transaction = make_transaction(payee)
+    automaton = classifier._automaton
+    try:
+        classifier._automaton = None
+        regex_result = classifier._apply_rules(transaction)
+    finally:
+        classifier._automaton = automaton
+    return classifier._apply_rules(transaction), regex_result
+
+
+@pytest.mark.parametrize(
+    ("payee", "expected"),
+    [
+        ("SAFEWAY #1234", "Groceries"),
+        ("Shell Oil 5551", "Gas & Fuel"),
+        # Leftmost match wins, regardless of rule order
+        ("SHELL STATION AT TARGET", "Gas & Fuel"),
+        ("TARGET T-1234 SHELL", "Groceries"),
+        ("UNKNOWN MERCHANT", None),
+        # Unicode case folding must not produce match text missing from the rule map
+        ("CHİPOTLE MEXICAN GRILL", None),
+        ("ſhell oil", None),
+    ],
+)
+def test_rule_precedence(classifier, payee, expected):
+    assert apply_rules_both_ways(classifier, payee) == (expected, expected)
+
+
+def test_longest_pattern_wins_at_same_position(classifier):
+    use_rules(classifier, {"blue": "Shopping", "blue bottle": "Coffee Shops"})
+
+    assert classifier._apply_rules(make_transaction("BLUE BOTTLE COFFEE")) == "Coffee Shops"
+    assert classifier._apply_rules(make_transaction("BLUE APRON")) == "Shopping"
+
+
+def test_regex_and_automaton_agree(classifier):
+    pytest.importorskip("ahocorasick")
+    assert classifier._automaton is not None
+
+    patterns = list(classifier.rules)
+    payees = [f"POS {pattern.upper()} #42" for pattern in patterns]
+    # Pairs of patterns in both orders exercise leftmost and longest-match ties
+    payees += [f"{a} {b}" for a in patterns[::7] for b in patterns[::5]]
+    payees += ["", "NO MATCH HERE", "sHeLl", "whole foods market / target"]
+    payees += ["CHİPOTLE MEXICAN GRILL", "ſhell oil"]
+
+    for payee in payees:
+        automaton_result, regex_result = apply_rules_both_ways(classifier, payee)
+        assert automaton_result == regex_result, payee
+
+
+def response(text: str) -> list:
+    """Wrap text as the content blocks of an API response."""
+    return [SimpleNamespace(type="text", text=text)]
+
+
+def test_parse_group_response(classifier):
+    content = response(
+        '{"id": 1, "index": 0, "confidence": 0.9},'
+        ' {"id": "2", "category": "dining", "confidence": 0.5}]'
+    )
+
+    assert classifier._parse_group_response(content, CATEGORIES) == {
+        1: ("Groceries", 0.9),
+        2: ("Dining", 0.5),
+    }
+
+
+def test_parse_group_response_skips_malformed_entries(classifier):
+    content = response(
+        '{"id": "x", "index": 0}, 5, {"index": 1},'
+        ' {"id": 3, "index": 99, "confidence": 0.8},'
+        ' {"id": 4, "index": true, "confidence": 0.8},'
+        ' {"id": 5, "index": 2, "confidence": 0.7}]'
+    )
+
+    assert classifier._parse_group_response(content, CATEGORIES) == {
+        3: ("Uncategorized", 0.0),
+        4: ("Uncategorized", 0.0),
+        5: ("Gas & Fuel", 0.7),
+    }
+
+
+@pytest.mark.parametrize("text", ["", "not json", '{"id": 1, "index": 0}', "]"])
+def test_parse_group_response_rejects_invalid_json(classifier, text):
+    assert classifier._parse_group_response(response(text), CATEGORIES) == {}
+
+
+def test_parse_group_response_without_content(classifier):
+    assert classifier._parse_group_response([], CATEGORIES) == {}
+
+
+class FakeBatches:
+    """Message Batches API stub whose job never finishes polling."""
+
+    def __init__(self, status: str = "in_progress"):
+        self.status = status
+        self.canceled = []
+
+    def create(self, requests):
+        return SimpleNamespace(id="batch-1", processing_status=self.status)
+
+    def retrieve(self, batch_id):
+        raise ConnectionError("connection reset")
+
+    def results(self, batch_id):
+        raise ConnectionError("connection reset")
+
+    def cancel(self, batch_id):
+        self.canceled.append(batch_id)
+
+
+class FakeMessages:
+    """Messages API stub answering every single-transaction request with index 0."""
+
+    def __init__(self, batches: FakeBatches):
+        self.batches = batches
+
+    @contextmanager
+    def stream(self, **kwargs):
+        yield SimpleNamespace(text_stream=iter(['"index": 0, "confidence": 0.9}']))
+
+
+@pytest.mark.parametrize(("status", "canceled"), [("in_progress", ["batch-1"]), ("ended", [])])
+def test_failed_batch_is_canceled_before_fallback(classifier, monkeypatch, status, canceled):
+    batches = FakeBatches(status)
+    classifier.client = SimpleNamespace(messages=FakeMessages(batches))
+    monkeypatch.setattr(classifier_module.time, "sleep", lambda seconds: None)
+
+    transactions = [make_transaction("MERCHANT A", 1), make_transaction("MERCHANT B", 2)]
+    results = classifier._classify_with_batch(transactions, CATEGORIES)
+
+    # A job that already ended can't be canceled; either way, singletons fill in
+    assert batches.canceled == canceled
+    assert results == {1: ("Groceries", 0.9), 2: ("Groceries", 0.9)}
+
+
+def test_prompt_and_lookup_follow_a_mutated_category_list(classifier):
+    categories = ["Dining", "Groceries"]
+    classifier._build_system(categories)
+    classifier._category_lookup(categories)
+
+    # Same list object, new contents: the numbering must match the live list
+    categories.insert(0, "Books")
+
+    assert "0) Books\n1) Dining\n2) Groceries" in classifier._build_system(categories)[0]["text"]
+    assert classifier._resolve_choice({"index": 1, "confidence": 0.9}, categories) == ("Dining", 0.9)
+    assert classifier._category_lookup(categories)["books"] == "Books"
+
+
+@pytest.mark.parametrize(
+    "payees",
+    [
+        ("CHECK 1001", "CHECK 1002"),
+        ("Unknown", "Unknown"),
+        ("12345", "67890"),
+    ],
+)
+def test_generic_payees_get_distinct_signatures(classifier, payees):
+    first, second = (make_transaction(payee, index) for index, payee in enumerate(payees, 1))
+
+    assert classifier._signature(first) != classifier._signature(second)
+
+
+def test_same_merchant_shares_signature(classifier):
+    first = make_transaction("STARBUCKS #12", 1)
+    second = make_transaction("Starbucks 99", 2)
+
+    assert classifier._signature(first) == classifier._signature(second)
+
+
+class FakeAsyncMessages:
+    """Async Messages API stub counting streamed requests."""
+
+    def __init__(self):
+        self.requests = []
+
+    @asynccontextmanager
+    async def stream(self, **kwargs):
+        self.requests.append(kwargs)
+
+        async def text_stream():
+            yield '"index": 1, "confidence": 0.9}'
+
+        yield SimpleNamespace(text_stream=text_stream())
+
+
+def test_aclassify_many_sends_one_request_per_merchant(classifier):
+    messages = FakeAsyncMessages()
+    classifier.async_client = SimpleNamespace(messages=messages)
+    payees = ["BLUE HERON CAFE #12", "Blue Heron Cafe 99", "CHECK 1001", "CHECK 1002", "Unknown", "12345"]
+    transactions = [make_transaction(payee, index) for index, payee in enumerate(payees, 1)]
+
+    results = asyncio.run(classifier.aclassify_many(transactions, CATEGORIES))
+
+    # The two cafe visits share one answer; every generic payee is asked about alone
+    assert len(messages.requests) == 5
+    assert results == {index: ("Dining", 0.9) for index in range(1, 7)}
@@ -0,0 +1,63 @@
+"""Tests for the client-side token-bucket rate limiter."""
+
+import asyncio
+
+import pytest
+
+from bookkeeper import rate_limit
+from bookkeeper.rate_limit import RateLimiter
+
+
+@pytest.fixture
+def clock(monkeypatch) -> list[float]:
+    """Fake monotonic clock; sleeping advances it instead of waiting."""
+    now = [1000.0]
+
+    async def fake_sleep(seconds: float) -> None:
+        now[0] += seconds
+
+    monkeypatch.setattr(rate_limit.time, "monotonic", lambda: now[0])
+    monkeypatch.setattr(rate_limit.asyncio, "sleep", fake_sleep)
+    return now
+
+
+def acquire_all(limiter: RateLimiter, tokens: list[int]) -> None:
+    async def run() -> None:
+        for count in tokens:
+            await limiter.acquire(count)
+
+    asyncio.run(run())
+
+
+def test_burst_up_to_request_limit_without_waiting(clock):
+    limiter = RateLimiter(requests_per_minute=5, tokens_per_minute=1000)
+
+    acquire_all(limiter, [10] * 5)
+
+    assert clock[0] == 1000.0
+
+
+def test_waits_for_request_bucket_to_refill(clock):
+    limiter = RateLimiter(requests_per_minute=60, tokens_per_minute=100_000)
+
+    acquire_all(limiter, [1] * 61)
+
+    # One request refills every second once the burst is spent
+    assert clock[0] == pytest.approx(1001.0)
+
+
+def test_waits_for_token_bucket_to_refill(clock):
+    limiter = RateLimiter(requests_per_minute=100, tokens_per_minute=1000)
+
+    acquire_all(limiter, [600, 600])
+
+    # The second request needs 200 more tokens: 0.2 minutes of refill
+    assert clock[0] == pytest.approx(1012.0)
+
+
+def test_oversized_request_is_clamped_to_bucket(clock):
+    limiter = RateLimiter(requests_per_minute=100, tokens_per_minute=100)
+
+    acquire_all(limiter, [1000])
+
+    assert clock[0] == 1000.0
@@ -0,0 +1,120 @@
+"""Tests for reading transactions from the Quicken database."""
+
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from bookkeeper import reader as reader_module
+from bookkeeper.reader import CASHFLOW_PARENT_INDEX, QuickenReader
+
+
+def entry_indexes(quicken_file: Path) -> set[str]:
+    """Return the names of the indexes on the cashflow entry table."""
+    conn = sqlite3.connect(quicken_file / "data")
+    try:
+        return {row[1] for row in conn.execute("PRAGMA index_list(ZCASHFLOWTRANSACTIONENTRY)")}
+    finally:
+        conn.close()
+
+
+def drop_parent_index(quicken_file: Path) -> None:
+    conn = sqlite3.connect(quicken_file / "data")
+    conn.execute("DROP INDEX ZCASHFLOWTRANSACTIONENTRY_ZPARENT_INDEX")
+    conn.commit()
+    conn.close()
+
+
+def categorize_entries(quicken_file: Path) -> None:
+    """Tag entry 1 Groceries and split transaction 3's entries '' and 'Uncategorized'."""
+    conn = sqlite3.connect(quicken_file / "data")
+    conn.executemany("INSERT INTO ZTAG VALUES (?, ?, 1)", [(5, ""), (6, "Uncategorized")])
+    conn.executemany(
+        "UPDATE ZCASHFLOWTRANSACTIONENTRY SET ZCATEGORYTAG = ? WHERE Z_PK = ?",
+        [(1, 1), (5, 2), (6, 3)],
+    )
+    conn.commit()
+    conn.close()
+
+
+def rows(transactions) -> list[tuple]:
+    """(id, category) per row, newest first; split entries of one transaction sorted."""
+    return sorted(((t.id, t.category) for t in transactions), key=lambda r: (-r[0], str(r[1])))
+
+
+def test_reads_one_row_per_entry_newest_first(quicken_file):
+    categorize_entries(quicken_file)
+
+    with QuickenReader(quicken_file) as reader:
+        transactions = reader.read_transactions()
+
+    assert [t.id for t in transactions] == [4, 3, 3, 2, 1]
+    assert rows(transactions) == [
+        (4, None), (3, ""), (3, "Uncategorized"), (2, None), (1, "Groceries"),
+    ]
+
+
+def test_only_uncategorized_excludes_categorized_rows(quicken_file):
+    categorize_entries(quicken_file)
+
+    with QuickenReader(quicken_file) as reader:
+        transactions = reader.read_transactions(only_uncategorized=True)
+
+    # No entry, an empty name, and "Uncategorized" all count; each split entry is a row
+    assert rows(transactions) == [(4, None), (3, ""), (3, "Uncategorized"), (2, None)]
+
+
+def test_iter_transactions_streams_across_fetch_batches(quicken_file, monkeypatch):
+    monkeypatch.setattr(reader_module, "FETCH_BATCH_SIZE", 2)
+
+    with QuickenReader(quicken_file) as reader:
+        transactions = list(reader.iter_transactions())
+
+    assert [t.id for t in transactions] == [4, 3, 3, 2, 1]
+    assert transactions[0].amount == -40.0
+    assert transactions[0].payee == "SAFEWAY #1234"
+
+
+def test_reader_is_read_only_by_default(quicken_file):
+    drop_parent_index(quicken_file)
+
+    with QuickenReader(quicken_file) as reader:
+        assert len(reader.read_transactions()) == 5
+        with pytest.raises(sqlite3.OperationalError, match="readonly"):
+            reader._conn().execute("CREATE TABLE scratch (x)")
+
+    assert entry_indexes(quicken_file) == set()
+
+
+def test_writable_reader_adds_missing_parent_index(quicken_file):
+    drop_parent_index(quicken_file)
+
+    with QuickenReader(quicken_file, read_only=False) as reader:
+        reader.read_transactions()
+
+    assert entry_indexes(quicken_file) == {CASHFLOW_PARENT_INDEX}
+
+
+def test_writable_reader_keeps_existing_parent_index(quicken_file):
+    with QuickenReader(quicken_file, read_only=False) as reader:
+        reader.read_transactions()
+
+    assert entry_indexes(quicken_file) == {"ZCASHFLOWTRANSACTIONENTRY_ZPARENT_INDEX"}
+
+
+def test_locked_file_skips_index_without_failing(quicken_file):
+    drop_parent_index(quicken_file)
+
+    # Another writer's RESERVED lock lets us read but makes CREATE INDEX fail
+    writer = sqlite3.connect(quicken_file / "data", isolation_level=None)
+    writer.execute("BEGIN IMMEDIATE")
+    conn = sqlite3.connect(quicken_file / "data", timeout=0)
+    try:
+        QuickenReader._ensure_parent_index(conn)
+        assert conn.execute("SELECT COUNT(*) FROM ZTRANSACTION").fetchone()[0] == 4
+    finally:
+        conn.close()
+        writer.execute("ROLLBACK")
+        writer.close()
+
+    assert entry_indexes(quicken_file) == set()
@@ -0,0 +1,154 @@
+"""Tests for writing category updates back to the Quicken database."""
+
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from bookkeeper.writer import QuickenWriter
+
+
+def entries(quicken_file: Path) -> dict[int, tuple]:
+    """Map cashflow entry Z_PK -> (Z_ENT, ZPARENT, ZAMOUNT, ZCATEGORYTAG)."""
+    conn = sqlite3.connect(quicken_file / "data")
+    try:
+        return {
+            row[0]: row[1:]
+            for row in conn.execute(
+                "SELECT Z_PK, Z_ENT, ZPARENT, ZAMOUNT, ZCATEGORYTAG FROM ZCASHFLOWTRANSACTIONENTRY"
+            )
+        }
+    finally:
+        conn.close()
+
+
+def z_max(quicken_file: Path) -> int:
+    """Return Z_PRIMARYKEY.Z_MAX for cashflow entries."""
+    conn = sqlite3.connect(quicken_file / "data")
+    try:
+        return conn.execute("SELECT Z_MAX FROM Z_PRIMARYKEY WHERE Z_ENT = 80").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_updates_existing_entry(quicken_file):
+    with QuickenWriter(quicken_file / "data") as writer:
+        assert writer.update_categories({1: "Dining"}) == {1: True}
+
+    assert entries(quicken_file)[1] == (80, 1, -10.0, 2)
+
+
+def test_creates_missing_entries_with_transaction_amount(quicken_file):
+    with QuickenWriter(quicken_file / "data") as writer:
+        results = writer.update_categories({4: "Dining", 2: "Groceries"})
+
+    assert results == {2: True, 4: True}
+    # Keys continue from Z_MAX, not MAX(Z_PK), and are numbered by transaction ID
+    created = entries(quicken_file)
+    assert created[11] == (80, 2, -20.0, 1)
+    assert created[12] == (80, 4, -40.0, 2)
+    assert z_max(quicken_file) == 12
+
+
+def test_creates_entry_for_single_update(quicken_file):
+    with QuickenWriter(quicken_file / "data") as writer:
+        assert writer.update_category(2, "Dining")
+
+    assert entries(quicken_file)[11] == (80, 2, -20.0, 2)
+    assert z_max(quicken_file) == 11
+
+
+def test_falls_back_to_max_pk_without_primary_key_table(quicken_file):
+    conn = sqlite3.connect(quicken_file / "data")
+    conn.execute("DROP TABLE Z_PRIMARYKEY")
+    conn.commit()
+    conn.close()
+
+    with QuickenWriter(quicken_file / "data") as writer:
+        assert writer.update_categories({2: "Dining"}) == {2: True}
+
+    assert entries(quicken_file)[4] == (80, 2, -20.0, 2)
+
+
+def test_duplicate_category_name_uses_lowest_pk(quicken_file):
+    with QuickenWriter(quicken_file / "data") as writer:
+        writer.update_categories({1: "Groceries"})
+
+    assert entries(quicken_file)[1][3] == 1
+
+
+def test_unknown_and_non_assignable_categories_fail(quicken_file):
+    before = entries(quicken_file)
+
+    with QuickenWriter(quicken_file / "data") as writer:
+        results = writer.update_categories({1: "Nonexistent", 2: "Hidden", 4: "Dining"})
+
+    assert results == {1: False, 2: False, 4: True}
+    after = entries(quicken_file)
+    # Failed transactions are untouched, and no entry is created for them
+    assert after[1] == before[1]
+    assert not any(entry[1] == 2 for entry in after.values())
+    assert after[11] == (80, 4, -40.0, 2)
+
+
+def test_duplicate_transaction_id_last_pair_wins(quicken_file):
+    with QuickenWriter(quicken_file / "data") as writer:
+        results = writer.update_categories_batch([(1, "Dining"), (1, "Groceries")])
+
+    assert results == {1: True}
+    assert entries(quicken_file)[1][3] == 1
+
+
+def test_split_transaction_updates_lowest_entry(quicken_file):
+    with QuickenWriter(quicken_file / "data") as writer:
+        assert writer.update_categories({3: "Dining"}) == {3: True}
+
+    after = entries(quicken_file)
+    assert after[2][3] == 2
+    assert after[3][3] is None
+
+
+def test_failing_input_rolls_back_and_drops_temp_table(quicken_file):
+    before = entries(quicken_file)
+
+    def updates():
+        yield 2, "Dining"
+        raise RuntimeError("input failed")
+
+    with QuickenWriter(quicken_file / "data") as writer:
+        with pytest.raises(RuntimeError, match="input failed"):
+            writer.update_categories_batch(updates())
+
+        conn = writer._conn()
+        assert not conn.in_transaction
+        assert conn.execute("SELECT name FROM sqlite_temp_master").fetchall() == []
+
+        # The connection is still usable afterwards
+        assert writer.update_categories({1: "Dining"}) == {1: True}
+
+    after = entries(quicken_file)
+    assert not any(entry[1] == 2 for entry in after.values())
+    assert after[1] == (80, 1, -10.0, 2)
+    assert len(after) == len(before)
+    assert z_max(quicken_file) == 10
+
+
+def test_failed_commit_rolls_back_and_leaves_connection_usable(quicken_file):
+    with QuickenWriter(quicken_file / "data") as writer:
+        writer._conn().execute("PRAGMA busy_timeout = 0")
+
+        # An open read transaction blocks the writer's COMMIT, not its BEGIN IMMEDIATE
+        reader = sqlite3.connect(quicken_file / "data", isolation_level=None)
+        reader.execute("BEGIN")
+        reader.execute("SELECT COUNT(*) FROM ZTAG").fetchone()
+        with pytest.raises(sqlite3.OperationalError, match="locked"):
+            writer.update_categories({1: "Dining"})
+        reader.execute("COMMIT")
+        reader.close()
+
+        assert not writer._conn().in_transaction
+        assert entries(quicken_file)[1][3] is None
+
+        assert writer.update_categories({1: "Dining"}) == {1: True}
+
+    assert entries(quicken_file)[1][3] == 2